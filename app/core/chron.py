@@ -1,9 +1,199 @@
 # -*- coding: utf-8 -*-
+import abc
+import time
+import bisect
+from zoneinfo import (
+    ZoneInfo,
+    ZoneInfoNotFoundError
+)
 from datetime import (
     datetime as dt,
     timedelta
 )
-from typing import Optional
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple
+)
+
+
+class ChronClock(object):
+    """Class of the current date and time for the calculations."""
+
+    # Fixed date and time of the calculations, None - datetime.now().
+    reference: Optional[dt] = None
+
+    @classmethod
+    def now(cls) -> dt:
+        """Method returns the reference or the current date and time."""
+        if cls.reference is None:
+            return dt.now()
+        return cls.reference
+
+
+class LocalZone(object):
+    """Class of the system time zone, as the naive datetime."""
+
+    __slots__ = ()
+
+    name = ""
+
+    def to_wall(self, timestamp: float) -> dt:
+        """Method returns the naive local date and time."""
+        return dt.fromtimestamp(timestamp)
+
+    def to_timestamp(self, wall: dt, after: float = None) -> float:
+        """
+        Method returns the timestamp of the local date and time.
+        --------------------------------------------------------
+        The repeated time is taken the first time after the timestamp \
+            "after", if there is one.
+        """
+        first = wall.replace(fold=0).timestamp()
+        if after is not None and first <= after:
+            second = wall.replace(fold=1).timestamp()
+            if second > after:
+                return second
+        return first
+
+
+class ZoneTable(object):
+    """Class of the cached UTC offsets of the time zone."""
+
+    __slots__ = ("name", "zone", "start", "end", "points", "offsets")
+
+    # Calculated time zones, the key is the zone name.
+    __TABLES__: Dict[str, "ZoneTable | LocalZone"] = {"": LocalZone()}
+
+    EPOCH = dt(1970, 1, 1)
+    # Period of the table (sec), it is rebuilt outside of the period.
+    HORIZON = 2 * 366 * 86400
+    # Offsets are checked hourly, the transitions are found exactly.
+    STEP = 3600
+
+    @classmethod
+    def get(cls, name: str) -> "ZoneTable | LocalZone":
+        """
+        Method returns the cached table of the time zone.
+        -------------------------------------------------
+        :type name: str
+        :param name: IANA time zone name, "" - system time zone.
+
+        :rtype: object
+        :returns: ZoneTable or LocalZone.
+        """
+        table = cls.__TABLES__.get(name)
+        if table is None:
+            table = cls.__TABLES__[name] = cls(name)
+        return table
+
+    def __init__(
+        self,
+        name: str,
+        timestamp: float = None
+    ) -> None:
+        """
+        ZoneTable constructor object for the time zone offsets.
+        -------------------------------------------------------
+        :type name: str
+        :param name: IANA time zone name, for example "Europe/Moscow".
+
+        :type timestamp: float
+        :param timestamp: beginning of the table, None - now.
+        """
+        if not isinstance(name, str):
+            raise TypeError(
+                "Invalid parameter type 'TZ'."
+                "May be 'str'"
+            )
+        try:
+            self.zone = ZoneInfo(name)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise ValueError(
+                f"Error. The TZ='{name}' is incorrect ("
+                "'TZ' must be the IANA time zone name)"
+            )
+        self.name = name
+        self.build(time.time() if timestamp is None else timestamp)
+
+    def utcoffset(self, timestamp: float) -> float:
+        """Method returns the UTC offset (sec) from zoneinfo."""
+        return dt.fromtimestamp(
+            timestamp, self.zone
+        ).utcoffset().total_seconds()
+
+    def build(self, timestamp: float) -> None:
+        """
+        Method calculates the offsets and transitions of the period.
+        ------------------------------------------------------------
+        :type timestamp: float
+        :param timestamp: timestamp inside of the period.
+        """
+        self.start = int(timestamp) - 2 * 86400
+        self.end = self.start + self.HORIZON
+        self.points = [self.start]
+        self.offsets = [self.utcoffset(self.start)]
+        for step in range(self.start, self.end, self.STEP):
+            offset = self.utcoffset(step + self.STEP)
+            if offset == self.offsets[-1]:
+                continue
+            low, high = step, step + self.STEP
+            while high - low > 1:
+                middle = (low + high) // 2
+                if self.utcoffset(middle) == offset:
+                    high = middle
+                else:
+                    low = middle
+            self.points.append(high)
+            self.offsets.append(offset)
+
+    def offset(self, timestamp: float) -> float:
+        """Method returns the UTC offset (sec) from the table."""
+        if not self.start <= timestamp < self.end:
+            self.build(timestamp)
+        return self.offsets[bisect.bisect(self.points, timestamp) - 1]
+
+    def to_wall(self, timestamp: float) -> dt:
+        """Method returns the naive date and time of the zone."""
+        return self.EPOCH + timedelta(
+            seconds=timestamp + self.offset(timestamp)
+        )
+
+    def to_timestamp(self, wall: dt, after: float = None) -> float:
+        """
+        Method returns the timestamp of the date and time of the zone.
+        --------------------------------------------------------------
+        The repeated time after the transition back is taken the \
+            first time after the timestamp "after", or the first time, \
+                if there is none. The missing time after the transition \
+                    forward is moved forward by the size of the \
+                        transition.
+
+        :type wall: datetime
+        :param wall: naive date and time of the zone.
+
+        :type after: float
+        :param after: reference timestamp, None - not set.
+
+        :rtype: float
+        :returns: timestamp.
+        """
+        local = (wall - self.EPOCH).total_seconds()
+        before = self.offset(local - 86400)
+        later = self.offset(local + 86400)
+        valid = [
+            local - x for x in {before, later}
+            if self.offset(local - x) == x
+        ]
+        ahead = [x for x in valid if after is not None and x > after]
+        if ahead:
+            return min(ahead)
+        if valid:
+            return min(valid)
+        return local - before
 
 
 class CheckMinute(object):
@@ -22,12 +212,12 @@ class CheckMinute(object):
         :rtype: datetime
         :returns: datetime(year, month, day, hour, minute, second).
         """
-        curMinute = dt.now().replace(
+        curMinute = ChronClock.now().replace(
             minute=curMinute,
             second=0,
             microsecond=0
         )
-        if curMinute.minute <= dt.now().minute:
+        if curMinute.minute <= ChronClock.now().minute:
             curMinute = curMinute + timedelta(minutes=60)
         return curMinute
 
@@ -43,7 +233,7 @@ class CheckMinute(object):
             year, month, day, hour, minute, second).
         """
         if minute is None or minute < 0:
-            minute = dt.now().minute
+            minute = ChronClock.now().minute
         if minute > 60:
             raise ValueError(
                 f"Error. The minute='{minute}' is incorrect ("
@@ -78,13 +268,13 @@ class CheckHour(object):
         :rtype: datetime
         :returns: datetime(year, month, day, hour, minute, second).
         """
-        curHour = dt.now().replace(
+        curHour = ChronClock.now().replace(
             hour=curHour,
             minute=curMinute,
             second=0,
             microsecond=0
         )
-        if curHour.time() < dt.now().time():
+        if curHour.time() < ChronClock.now().time():
             curHour = curHour + timedelta(hours=24)
         return curHour
 
@@ -107,7 +297,7 @@ class CheckHour(object):
             year, month, day, hour, minute, second).
         """
         if hour is None or hour < 0:
-            hour = dt.now().hour
+            hour = ChronClock.now().hour
         if hour > 24:
             raise ValueError(
                 f"Error. The hour='{hour}' is incorrect ("
@@ -171,12 +361,12 @@ class CheckDays(object):
         :returns: datetime(year, month, day, hour, minute, second).
         """
         countDayCurMonth = cls.calc_day_in_month(
-            dt.now().year,
-            dt.now().month
+            ChronClock.now().year,
+            ChronClock.now().month
         )
         if curDay > countDayCurMonth:
             curDay = (
-                dt.now() + timedelta(days=curDay)
+                ChronClock.now() + timedelta(days=curDay)
             ).replace(
                 day=curDay,
                 hour=curHour,
@@ -186,14 +376,14 @@ class CheckDays(object):
             )
             return curDay
 
-        curDay = dt.now().replace(
+        curDay = ChronClock.now().replace(
             day=curDay,
             hour=curHour,
             minute=curMinute,
             second=0,
             microsecond=0
         )
-        if curDay.timestamp() < dt.now().timestamp():
+        if curDay.timestamp() < ChronClock.now().timestamp():
             curDay = curDay + timedelta(days=countDayCurMonth)
 
         return curDay
@@ -221,7 +411,7 @@ class CheckDays(object):
             year, month, day, hour, minute, second).
         """
         if day is None or day < 0:
-            day = dt.now().day
+            day = ChronClock.now().day
         if day == 0 or day > 31:
             raise ValueError(
                 f"Error. The day='{day}' is incorrect ("
@@ -269,7 +459,7 @@ class CheckMonth(object):
         :rtype: datetime
         :returns: datetime(year, month, day, hour, minute, second).
         """
-        year = dt.now().year
+        year = ChronClock.now().year
         countDayCurMonth = checkDay(year, curMonth)  # Current year
         if curDay > countDayCurMonth:
             curMonth += 1
@@ -285,7 +475,7 @@ class CheckMonth(object):
             microsecond=0
         )
 
-        if cursorMonth.timestamp() < dt.now().timestamp():
+        if cursorMonth.timestamp() < ChronClock.now().timestamp():
             year += 1
             countDayCurMonth = checkDay(year, curMonth)  # Next year
             if curDay > countDayCurMonth:
@@ -325,7 +515,7 @@ class CheckMonth(object):
             year, month, day, hour, minute, second).
         """
         if month is None or month < 0:
-            month = dt.now().month
+            month = ChronClock.now().month
         if month == 0 or month > 12:
             raise ValueError(
                 f"Error. The month='{month}' is incorrect ("
@@ -392,7 +582,7 @@ class AddPlanTask(object):
             return CheckMinute(self.m).dTime
         else:
             return (
-                dt.now() + timedelta(minutes=1)
+                ChronClock.now() + timedelta(minutes=1)
             ).replace(
                 second=0,
                 microsecond=0
@@ -425,7 +615,7 @@ class AddIntervalTask(object):
         self.d = day
         self.h = hour
         self.m = minute
-        self.initDtime = dt.now()
+        self.initDtime = ChronClock.now()
 
     @property
     def calc_minute(self) -> dt:
@@ -523,8 +713,705 @@ class AddIntervalTask(object):
             return self.calc_minute
         else:
             return (
-                dt.now() + timedelta(minutes=1)
+                ChronClock.now() + timedelta(minutes=1)
             ).replace(
                 second=0,
                 microsecond=0
             )
+
+
+class BaseSchedule(abc.ABC):
+    """Base class of the compiled schedules."""
+
+    __slots__ = ()
+
+    TYPE: str = None
+
+    def key(self) -> tuple:
+        """
+        Method returns the type and the fields of the schedule.
+        -------------------------------------------------------
+        The field types are kept, the minutes 5 and the seconds 5.0 \
+            of IntervalTask are different schedules.
+        """
+        return (self.TYPE,) + tuple(
+            (type(getattr(self, x)), getattr(self, x))
+            for x in self.__slots__
+        )
+
+    def __eq__(self, other: object) -> bool:
+        """Method compares the schedules by key()."""
+        if not isinstance(other, BaseSchedule):
+            return NotImplemented
+        return self.key() == other.key()
+
+    def __hash__(self) -> int:
+        """Method returns the hash of key()."""
+        return hash(self.key())
+
+    @abc.abstractmethod
+    def next_from(self, now: dt) -> dt:
+        """Method calculates the next date and time after now."""
+
+    def next_after(self, timestamp: float) -> dt:
+        """
+        Method returns next_from() of the timestamp.
+        --------------------------------------------
+        :type timestamp: float
+        :param timestamp: current timestamp, the only "now" snapshot.
+
+        :rtype: datetime
+        :returns: datetime(year, month, day, hour, minute, second).
+        """
+        return self.next_from(dt.fromtimestamp(timestamp))
+
+    def iter_from(self, now: dt) -> Iterator[dt]:
+        """
+        Method lazily yields the next dates and times after now.
+        --------------------------------------------------------
+        Each next time is calculated one second after the previous \
+            one, as the scheduler does after the run. IntervalTask \
+                is counted from the previous time, the real interval \
+                    starts after the run. The generator stops, if \
+                        the schedule does not move forward.
+
+        :type now: datetime
+        :param now: start date and time.
+
+        :rtype: Iterator
+        :returns: datetime(year, month, day, hour, minute, second).
+        """
+        cursor = self.next_from(now)
+        while True:
+            yield cursor
+            dTime = self.next_from(cursor + timedelta(seconds=1))
+            if dTime <= cursor:
+                return
+            cursor = dTime
+
+
+class PlanSchedule(BaseSchedule):
+    """
+    Class of the compiled PlanTask for calculating the next date and time.
+    """
+
+    __slots__ = ("mo", "d", "h", "m")
+
+    TYPE = "PlanTask"
+
+    def __init__(
+        self,
+        month: int = None,
+        day: int = None,
+        hour: int = None,
+        minute: int = None
+    ) -> None:
+        """
+        PlanSchedule constructor object, the fields are checked once.
+        -------------------------------------------------------------
+        The calculation is the same as AddPlanTask, but all fields \
+            are read from one snapshot of the date and time.
+
+        args:
+            month: int - range of months [1..12] in the year.
+            day: int - range of days [1..31] in month.
+            hour: int - range [0..24] in day.
+            minute: int - range [0..60] in hour.
+        """
+        if month is not None and month >= 0 and not 0 < month <= 12:
+            raise ValueError(
+                f"Error. The month='{month}' is incorrect ("
+                "'month' must be in 1..12)"
+            )
+        if day is not None and day >= 0 and not 0 < day <= 31:
+            raise ValueError(
+                f"Error. The day='{day}' is incorrect ("
+                "'day' must be in 1..31)"
+            )
+        if hour is not None and hour > 24:
+            raise ValueError(
+                f"Error. The hour='{hour}' is incorrect ("
+                "'hour' must be in 0..24)"
+            )
+        if minute is not None and minute > 60:
+            raise ValueError(
+                f"Error. The minute='{minute}' is incorrect ("
+                "'minute' must be in 0..60)"
+            )
+        self.mo = month
+        self.d = day
+        self.h = hour
+        self.m = minute
+
+    def minute(self, now: dt) -> int:
+        """Method returns the minute of the task, as CheckMinute."""
+        if self.m is None or self.m < 0:
+            return now.minute
+        return self.m % 60
+
+    def hour(self, now: dt) -> int:
+        """Method returns the hour of the task, as CheckHour."""
+        if self.h is None or self.h < 0:
+            return now.hour
+        return self.h % 24
+
+    def next_minute(self, now: dt) -> dt:
+        """Method calculates the next minute of the hour."""
+        minute = self.minute(now)
+        curMinute = now.replace(minute=minute, second=0, microsecond=0)
+        if minute <= now.minute:
+            curMinute = curMinute + timedelta(minutes=60)
+        return curMinute
+
+    def next_hour(self, now: dt) -> dt:
+        """Method calculates the next hour of the day."""
+        curHour = now.replace(
+            hour=self.hour(now),
+            minute=self.minute(now),
+            second=0,
+            microsecond=0
+        )
+        if curHour.time() < now.time():
+            curHour = curHour + timedelta(hours=24)
+        return curHour
+
+    def next_day(self, now: dt) -> dt:
+        """Method calculates the next day of the month."""
+        day = self.d
+        if day is None or day < 0:
+            day = now.day
+        countDayCurMonth = CheckDays.calc_day_in_month(now.year, now.month)
+        if day > countDayCurMonth:
+            return (now + timedelta(days=day)).replace(
+                day=day,
+                hour=self.hour(now),
+                minute=self.minute(now),
+                second=0,
+                microsecond=0
+            )
+        curDay = now.replace(
+            day=day,
+            hour=self.hour(now),
+            minute=self.minute(now),
+            second=0,
+            microsecond=0
+        )
+        if curDay < now:
+            curDay = curDay + timedelta(days=countDayCurMonth)
+        return curDay
+
+    def next_month(self, now: dt) -> dt:
+        """Method calculates the next month of the year."""
+        month, day = self.mo, self.d
+        if month is None or month < 0:
+            month = now.month
+        year = now.year
+        countDayCurMonth = CheckDays.calc_day_in_month(year, month)
+        if day > countDayCurMonth:
+            month += 1
+            day -= countDayCurMonth
+        cursorMonth = dt(
+            year=year,
+            month=month,
+            day=day,
+            hour=self.hour(now),
+            minute=self.minute(now)
+        )
+        if cursorMonth < now:
+            year += 1
+            countDayCurMonth = CheckDays.calc_day_in_month(year, month)
+            if day > countDayCurMonth:
+                month += 1
+                day -= countDayCurMonth
+            cursorMonth = cursorMonth.replace(
+                year=year,
+                month=month,
+                day=day
+            )
+        return cursorMonth
+
+    def next_from(self, now: dt) -> dt:
+        """
+        Method for obtaining the planning date and time.
+        ------------------------------------------------
+        :type now: datetime
+        :param now: current date and time, the only "now" snapshot.
+
+        :rtype: datetime
+        :returns: datetime(year, month, day, hour, minute, second).
+        """
+        if self.mo is not None:
+            return self.next_month(now)
+        elif self.d is not None:
+            return self.next_day(now)
+        elif self.h is not None:
+            return self.next_hour(now)
+        elif self.m is not None:
+            return self.next_minute(now)
+        return (now + timedelta(minutes=1)).replace(
+            second=0,
+            microsecond=0
+        )
+
+
+class IntervalSchedule(BaseSchedule):
+    """
+    Class of the compiled IntervalTask for calculating the next date and time.
+    """
+
+    __slots__ = ("mo", "d", "h", "m")
+
+    TYPE = "IntervalTask"
+
+    def __init__(
+        self,
+        month: int | float = None,
+        day: int | float = None,
+        hour: int | float = None,
+        minute: int | float = None
+    ) -> None:
+        """
+        IntervalSchedule constructor object, the fields are set once.
+        -------------------------------------------------------------
+        The calculation is the same as AddIntervalTask, but all \
+            fields are read from one snapshot of the date and time.
+
+        args:
+            month: int | float - range of numbers [0..n or 0.1..n] months \
+                of the year.
+            day: int | float - range of numbers [0..n or 0.1..n] days \
+                in a month.
+            hour: int | float - number range [0..n or 0.1..n] hour per day.
+            minute: int - number range [0..n] minutes in hour.
+            minute: float - range of numbers [0,1..n] seconds in minutes.
+        """
+        self.mo = month
+        self.d = day
+        self.h = hour
+        self.m = minute
+
+    @staticmethod
+    def value(field: int | float | None) -> int | float:
+        """Method returns 0 for the empty or negative field."""
+        if field is None or field < 0:
+            return 0
+        return field
+
+    def next_minute(self, now: dt) -> dt:
+        """Method calculates the minutes or seconds interval."""
+        minute = self.value(self.m)
+        if isinstance(minute, float):
+            return (now + timedelta(seconds=minute)).replace(microsecond=0)
+        return (now + timedelta(minutes=minute)).replace(
+            second=0,
+            microsecond=0
+        )
+
+    def next_hour(self, now: dt) -> dt:
+        """Method calculates the hours interval."""
+        curMinute = self.next_minute(now)
+        return (now + timedelta(hours=self.value(self.h))).replace(
+            minute=curMinute.minute,
+            second=curMinute.second,
+            microsecond=0
+        )
+
+    def next_day(self, now: dt) -> dt:
+        """Method calculates the days interval."""
+        curHour = self.next_hour(now)
+        return (now + timedelta(days=self.value(self.d))).replace(
+            hour=curHour.hour,
+            minute=curHour.minute,
+            second=curHour.second,
+            microsecond=0
+        )
+
+    def period(self) -> float:
+        """
+        Method returns the nominal interval of the fields.
+        --------------------------------------------------
+        The month is 30.4375 days, as in next_from().
+
+        :rtype: float
+        :returns: interval (sec), 0 - the interval is not set.
+        """
+        minute = self.value(self.m)
+        return (
+            self.value(self.mo) * 30.4375 * 86400 +
+            self.value(self.d) * 86400 +
+            self.value(self.h) * 3600 +
+            (minute if isinstance(minute, float) else minute * 60)
+        )
+
+    def grid(self, anchor: dt, run: int) -> dt:
+        """
+        Method returns the time of the run on the fixed-rate grid.
+        ----------------------------------------------------------
+        :type anchor: datetime
+        :param anchor: first time of the task.
+
+        :type run: int
+        :param run: number of the run, 0 - the anchor.
+
+        :rtype: datetime
+        :returns: anchor + run * period().
+        """
+        return anchor + timedelta(seconds=run * self.period())
+
+    def next_run(self, anchor: dt, now: dt) -> int:
+        """
+        Method returns the number of the first grid time after now.
+        -----------------------------------------------------------
+        The runs missed because of the lateness are skipped, the \
+            next time stays on the grid of the anchor.
+
+        :type anchor: datetime
+        :param anchor: first time of the task.
+
+        :type now: datetime
+        :param now: current date and time.
+
+        :rtype: int
+        :returns: number of the run, 0 - now is before the anchor.
+        """
+        if now < anchor:
+            return 0
+        return int((now - anchor).total_seconds() // self.period()) + 1
+
+    def iter_rate(self, now: dt) -> Iterator[dt]:
+        """
+        Method lazily yields the fixed-rate times after now.
+        ----------------------------------------------------
+        :type now: datetime
+        :param now: start date and time.
+
+        :rtype: Iterator
+        :returns: datetime(year, month, day, hour, minute, second).
+        """
+        if self.period() <= 0:
+            yield from self.iter_from(now)
+            return
+        anchor = self.next_from(now)
+        run = 0
+        while True:
+            yield self.grid(anchor, run)
+            run += 1
+
+    def next_from(self, now: dt) -> dt:
+        """
+        Method for obtaining date and time intervals.
+        ---------------------------------------------
+        :type now: datetime
+        :param now: current date and time, the only "now" snapshot.
+
+        :rtype: datetime
+        :returns: datetime(year, month, day, hour, minute, second).
+        """
+        if self.mo is not None:
+            return self.next_day(now) + timedelta(
+                days=self.value(self.mo) * 30.4375
+            )
+        elif self.d is not None:
+            return self.next_day(now)
+        elif self.h is not None:
+            return self.next_hour(now)
+        elif self.m is not None:
+            return self.next_minute(now)
+        return (now + timedelta(minutes=1)).replace(
+            second=0,
+            microsecond=0
+        )
+
+
+class CronSchedule(BaseSchedule):
+    """
+    Class of the compiled cron expression for calculating the next time.
+    """
+
+    __slots__ = (
+        "expr",
+        "minutes",
+        "hours",
+        "days",
+        "months",
+        "weekdays",
+        "anyDay"
+    )
+
+    TYPE = "CronTask"
+
+    # Field: (minimum, maximum, names).
+    FIELDS = (
+        (0, 59, None),
+        (0, 23, None),
+        (1, 31, None),
+        (1, 12, (
+            "jan", "feb", "mar", "apr", "may", "jun",
+            "jul", "aug", "sep", "oct", "nov", "dec"
+        )),
+        (0, 7, ("sun", "mon", "tue", "wed", "thu", "fri", "sat"))
+    )
+
+    # Longest months, February 29 is in the leap years.
+    MONTH_DAYS = (31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+    MACROS = {
+        "@yearly": "0 0 1 1 *",
+        "@annually": "0 0 1 1 *",
+        "@monthly": "0 0 1 * *",
+        "@weekly": "0 0 * * 0",
+        "@daily": "0 0 * * *",
+        "@midnight": "0 0 * * *",
+        "@hourly": "0 * * * *"
+    }
+
+    @classmethod
+    def parse_value(
+        cls,
+        value: str,
+        field: tuple
+    ) -> int:
+        """
+        Method for converting the field value or name to the number.
+        ------------------------------------------------------------
+        :type value: str
+        :param value: number or name (jan, mon, ...).
+
+        :type field: tuple
+        :param field: (minimum, maximum, names).
+
+        :rtype: int
+        :returns: field value.
+        """
+        low, high, names = field
+        if names is not None and value.lower() in names:
+            return names.index(value.lower()) + low
+        if not value.isdigit() or not low <= int(value) <= high:
+            raise ValueError(value)
+        return int(value)
+
+    @classmethod
+    def parse_field(
+        cls,
+        expr: str,
+        field: tuple
+    ) -> int:
+        """
+        Method for converting the cron field to the bitmask.
+        ----------------------------------------------------
+        The field supports "*", lists "1,15", ranges "1-5", \
+            steps "*/5", "1-30/5", "10/5" and names "jan", "mon".
+
+        :type expr: str
+        :param expr: cron field.
+
+        :type field: tuple
+        :param field: (minimum, maximum, names).
+
+        :rtype: int
+        :returns: bitmask, bit N is set, if the value N is allowed.
+        """
+        low, high, _ = field
+        mask = 0
+        for item in expr.split(","):
+            rng, _, step = item.partition("/")
+            step = int(step) if step else 1
+            if step < 1:
+                raise ValueError(item)
+            if rng == "*":
+                start, stop = low, high
+            elif "-" in rng:
+                start, stop = (
+                    cls.parse_value(x, field) for x in rng.split("-", 1)
+                )
+            else:
+                start = stop = cls.parse_value(rng, field)
+                if "/" in item:
+                    stop = high
+            if start > stop:
+                raise ValueError(item)
+            for value in range(start, stop + 1, step):
+                mask |= 1 << value
+        return mask
+
+    @staticmethod
+    def next_bit(mask: int, value: int) -> int | None:
+        """
+        Method returns the lowest set bit not less than the value.
+        ----------------------------------------------------------
+        :type mask: int
+        :param mask: field bitmask.
+
+        :type value: int
+        :param value: first checked value.
+
+        :rtype: int | None
+        :returns: allowed value or None, if there are no such bits.
+        """
+        mask >>= value
+        if not mask:
+            return None
+        return value + (mask & -mask).bit_length() - 1
+
+    def __init__(self, expr: str) -> None:
+        """
+        CronSchedule constructor object, the expression is parsed once.
+        ---------------------------------------------------------------
+        :type expr: str
+        :param expr: "minute hour day month weekday" or a macro \
+            (@hourly, @daily, @weekly, @monthly, @yearly).
+        """
+        if not isinstance(expr, str):
+            raise TypeError(
+                "Invalid parameter type 'CRON'."
+                "May be 'str'"
+            )
+        self.expr = expr
+        fields = self.MACROS.get(expr.strip().lower(), expr).split()
+        if len(fields) != 5:
+            raise ValueError(
+                f"Error. The CRON='{expr}' is incorrect ("
+                "'CRON' must contain 5 fields)"
+            )
+        try:
+            (
+                self.minutes,
+                self.hours,
+                self.days,
+                self.months,
+                self.weekdays
+            ) = (
+                self.parse_field(x, field)
+                for x, field in zip(fields, self.FIELDS)
+            )
+        except ValueError as err:
+            raise ValueError(
+                f"Error. The CRON='{expr}' is incorrect ("
+                f"invalid value '{err}')"
+            )
+        # Sunday is 0 and 7.
+        if self.weekdays & 1 << 7:
+            self.weekdays = (self.weekdays | 1) & ~(1 << 7)
+        # As in cron: if both day fields are restricted, any of them fits.
+        self.anyDay = not (
+            fields[2].startswith("*") or fields[4].startswith("*")
+        )
+        if not self.anyDay and not any(
+            self.months >> month & 1 and
+            self.days & (1 << days + 1) - 1
+            for month, days in enumerate(self.MONTH_DAYS, 1)
+        ):
+            raise ValueError(
+                f"Error. The CRON='{expr}' is incorrect ("
+                "the days are not in the months, it never matches)"
+            )
+
+    def match_day(self, day: dt) -> bool:
+        """Method checks the day of the month and the weekday."""
+        dayOk = bool(self.days >> day.day & 1)
+        weekOk = bool(self.weekdays >> (day.weekday() + 1) % 7 & 1)
+        if self.anyDay:
+            return dayOk or weekOk
+        return dayOk and weekOk
+
+    def next_from(self, now: dt) -> dt:
+        """
+        Method for obtaining the next date and time of the expression.
+        --------------------------------------------------------------
+        Impossible months, days, hours and minutes are skipped by \
+            the bitmasks, the minutes are not iterated one by one.
+
+        :type now: datetime
+        :param now: current date and time, the only "now" snapshot.
+
+        :rtype: datetime
+        :returns: datetime(year, month, day, hour, minute), after now.
+        """
+        cur = now.replace(
+            second=0,
+            microsecond=0
+        ) + timedelta(minutes=1)
+        # 28 years is the full cycle of the calendar and weekdays.
+        limit = cur.year + 28
+        while cur.year <= limit:
+            month = self.next_bit(self.months, cur.month)
+            if month is None:
+                cur = dt(cur.year + 1, 1, 1)
+                continue
+            if month != cur.month:
+                cur = dt(cur.year, month, 1)
+            lastDay = CheckDays.calc_day_in_month(cur.year, cur.month)
+            day = cur.day
+            while day <= lastDay and not self.match_day(
+                cur.replace(day=day)
+            ):
+                day += 1
+            if day > lastDay:
+                cur = (
+                    dt(cur.year, cur.month, lastDay) + timedelta(days=1)
+                )
+                continue
+            if day != cur.day:
+                cur = dt(cur.year, cur.month, day)
+            hour = self.next_bit(self.hours, cur.hour)
+            if hour is None:
+                cur = dt(cur.year, cur.month, cur.day) + timedelta(days=1)
+                continue
+            if hour != cur.hour:
+                cur = cur.replace(hour=hour, minute=0)
+            minute = self.next_bit(self.minutes, cur.minute)
+            if minute is None:
+                cur = cur.replace(minute=0) + timedelta(hours=1)
+                continue
+            return cur.replace(minute=minute)
+        raise ValueError(
+            f"Error. The CRON='{self.expr}' never matches a date"
+        )
+
+
+class ScheduleBatch(object):
+    """Class for calculating the next time of many schedules at once."""
+
+    @classmethod
+    def next_after(
+        cls,
+        schedules: Iterable[BaseSchedule | None],
+        timestamp: float,
+        zone: ZoneTable | LocalZone = None
+    ) -> List[Tuple[dt | None, float | None]]:
+        """
+        Method for calculating all schedules from one snapshot.
+        -------------------------------------------------------
+        Equal schedules are calculated once, the same dates are \
+            converted to the timestamp once.
+
+        :type schedules: Iterable
+        :param schedules: compiled schedules, None - not set.
+
+        :type timestamp: float
+        :param timestamp: current timestamp, the only "now" snapshot.
+
+        :type zone: object
+        :param zone: time zone of the schedules, None - system zone.
+
+        :rtype: list
+        :returns: [(datetime of the zone, timestamp), ...] in the \
+            order of schedules, (None, None) for the not set schedule.
+        """
+        zone = zone or ZoneTable.get("")
+        now = zone.to_wall(timestamp)
+        results: Dict[BaseSchedule, Tuple[dt, float]] = dict()
+        stamps: Dict[dt, float] = dict()
+        out: List[Tuple[dt | None, float | None]] = list()
+        for schedule in schedules:
+            if schedule is None:
+                out.append((None, None))
+                continue
+            result = results.get(schedule)
+            if result is None:
+                dTime = schedule.next_from(now)
+                if dTime not in stamps:
+                    stamps[dTime] = zone.to_timestamp(dTime, timestamp)
+                result = results[schedule] = (dTime, stamps[dTime])
+            out.append(result)
+        return out
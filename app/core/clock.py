@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+import time
+
+
+class MonotonicClock(object):
+    """Class for tracking wall-clock deadlines on the monotonic clock."""
+
+    @staticmethod
+    def measure() -> float:
+        """Method returns the offset between wall and monotonic clocks."""
+        return time.time() - time.monotonic()
+
+    def __init__(self, threshold: float = 2) -> None:
+        """
+        MonotonicClock constructor object for detecting clock jumps.
+        ------------------------------------------------------------
+        Deadlines are stored as monotonic timestamps, so NTP steps, \
+            VM pauses and host suspends change only the offset \
+                between the clocks.
+
+        :type threshold: float
+        :param threshold: minimum offset change (sec) that is \
+            considered as a wall-clock jump.
+        """
+        self.threshold = threshold
+        self.offset = self.measure()
+
+    def monotonic(self) -> float:
+        """Method returns the current monotonic timestamp."""
+        return time.monotonic()
+
+    def to_monotonic(self, timestamp: float) -> float:
+        """Method converts the wall-clock timestamp to monotonic."""
+        return timestamp - self.offset
+
+    def to_wall(self, deadline: float) -> float:
+        """Method converts the monotonic timestamp to wall-clock."""
+        return deadline + self.offset
+
+    def check(self) -> float:
+        """
+        Method for detecting the wall-clock jump.
+        -----------------------------------------
+        :rtype: float
+        :returns: jump size (sec), positive - forward, 0 - no jump.
+        """
+        offset = self.measure()
+        jump = offset - self.offset
+        if abs(jump) < self.threshold:
+            return 0.0
+        self.offset = offset
+        return jump
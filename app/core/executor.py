@@ -0,0 +1,822 @@
+# -*- coding: utf-8 -*-
+import os
+import abc
+import time
+import signal
+import asyncio
+import logging
+import itertools
+import threading
+import subprocess
+from typing import (
+    Callable,
+    Dict,
+    List
+)
+from concurrent.futures import ThreadPoolExecutor
+
+
+OVERLAP = (
+    "skip",      # the new run is dropped
+    "queue",     # one run is queued, the next ones are coalesced
+    "replace",   # the running process groups are killed
+    "parallel",  # up to PARALLEL runs, the next ones are dropped
+)
+PIPE_CHUNK = 64 * 1024    # read size of the command output (bytes)
+PIPE_LIMIT = 1024 * 1024  # longer output lines are logged in parts
+
+
+def checkExecute(execute: dict) -> None:
+    """
+    Function for checking the executor fields of the task.
+    ------------------------------------------------------
+    The fields are checked when the task is added, so a wrong value \
+        rejects the configuration instead of the task run.
+
+    :type execute: dict
+    :param execute: object BaseExportSchema.TASK[key].EXECUTE.
+    """
+    policy = execute.get("OVERLAP")
+    if policy and policy not in OVERLAP:
+        raise ValueError(
+            f"Error. The OVERLAP='{policy}' is incorrect ("
+            f"'OVERLAP' must be in {', '.join(OVERLAP)})"
+        )
+    limit = execute.get("PARALLEL")
+    if limit and (not isinstance(limit, int) or limit < 1):
+        raise ValueError(
+            f"Error. The PARALLEL='{limit}' is incorrect ("
+            "'PARALLEL' must be in 1..n)"
+        )
+    if execute.get("TIMEOUT") is not None:
+        checkTimeout(execute["TIMEOUT"])
+
+
+def checkTimeout(timeout: float) -> None:
+    """
+    Function for checking the execution time limit.
+    -----------------------------------------------
+    :type timeout: float
+    :param timeout: TIMEOUT (sec), 0 - no limit.
+    """
+    if (
+        isinstance(timeout, bool) or
+        not isinstance(timeout, (int, float)) or
+        timeout < 0
+    ):
+        raise ValueError(
+            f"Error. The TIMEOUT='{timeout}' is incorrect ("
+            "'TIMEOUT' must be a number, 0 or more)"
+        )
+
+
+def killProcessGroup(pid: int, signum: int) -> None:
+    """
+    Function for sending the signal to the command process group.
+    -------------------------------------------------------------
+    :type pid: int
+    :param pid: process id of the group leader.
+
+    :type signum: int
+    :param signum: system signal number.
+    """
+    try:
+        os.killpg(pid, signum)
+    except ProcessLookupError:
+        pass
+
+
+def runShellCmd(
+    cmd: str,
+    timeout: float = None,
+    killDelay: float = 5,
+    onStart: Callable[[int], None] = None
+) -> str:
+    """
+    Function for executing the shell command.
+    -----------------------------------------
+    :type cmd: str
+    :param cmd: shell command.
+
+    :type timeout: float
+    :param timeout: execution time limit (sec), None - no limit.
+
+    :type killDelay: float
+    :param killDelay: time (sec) between SIGTERM and SIGKILL.
+
+    :type onStart: callable
+    :param onStart: receives the process id of the started command.
+
+    :rtype: str
+    :returns: standard output of the command.
+    """
+    with subprocess.Popen(
+        cmd,
+        shell=True,
+        stdout=subprocess.PIPE,
+        text=True,
+        start_new_session=True
+    ) as proc:
+        if onStart is not None:
+            onStart(proc.pid)
+        try:
+            out, _ = proc.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            killProcessGroup(proc.pid, signal.SIGTERM)
+            try:
+                proc.communicate(timeout=killDelay)
+            except subprocess.TimeoutExpired:
+                killProcessGroup(proc.pid, signal.SIGKILL)
+                proc.communicate()
+            raise TimeoutError(cmd)
+    return out.strip()
+
+
+class BaseExecutor(abc.ABC):
+    """Base class for executing task commands."""
+
+    def __init__(
+        self,
+        logger: logging,
+        workers: int = 4,
+        timeout: float = 0,
+        killDelay: float = 5,
+        overlap: str = "queue",
+        parallel: int = 1
+    ) -> None:
+        """
+        BaseExecutor constructor object for executing task commands.
+        ------------------------------------------------------------
+        :type logger: object
+        :param logger: getLogger() function reference.
+
+        :type workers: int
+        :param workers: maximum number of tasks executed concurrently.
+
+        :type timeout: float
+        :param timeout: default task execution time limit (sec), \
+            0 - no limit.
+
+        :type killDelay: float
+        :param killDelay: time (sec) between SIGTERM and SIGKILL \
+            of the timed out process group.
+
+        :type overlap: str
+        :param overlap: default policy for a task whose previous run \
+            is still in progress: "skip", "queue", "replace", "parallel".
+
+        :type parallel: int
+        :param parallel: default limit of runs of one task \
+            for the "parallel" policy.
+        """
+        if not isinstance(workers, int) or workers < 1:
+            raise ValueError(
+                f"Error. The workers='{workers}' is incorrect ("
+                "'workers' must be in 1..n)"
+            )
+        checkTimeout(timeout)
+        self.logger = logger
+        self.workers = workers
+        self.timeout = timeout
+        self.killDelay = killDelay
+        self.overlap = overlap
+        self.parallel = parallel
+        self.get_overlap(dict())
+        # {task key: {run id: process id of the current command}}
+        self.active: Dict[str, Dict[int, int | None]] = dict()
+        # {process id of the running command: delayed SIGKILL}
+        self.alive: Dict[int, threading.Timer | None] = dict()
+        self.pending: Dict[str, dict] = dict()
+        self.cancelled = set()
+        self.skipped: Dict[str, int] = dict()
+        self.coalesced: Dict[str, int] = dict()
+        self.replaced: Dict[str, int] = dict()
+        self.counter = itertools.count()
+        self.lock = threading.Lock()
+
+    def running(self, key: str = None) -> int:
+        """Method returns the number of in-flight runs of the task."""
+        with self.lock:
+            if key is None:
+                return sum(len(x) for x in self.active.values())
+            return len(self.active.get(key, ()))
+
+    def stats(self, key: str) -> Dict[str, int]:
+        """Method returns the overlap counters of the task."""
+        with self.lock:
+            return {
+                "running": len(self.active.get(key, ())),
+                "skipped": self.skipped.get(key, 0),
+                "coalesced": self.coalesced.get(key, 0),
+                "replaced": self.replaced.get(key, 0)
+            }
+
+    def get_overlap(self, execute: dict) -> tuple[str, int]:
+        """
+        Method returns the task overlap policy.
+        ---------------------------------------
+        :type execute: dict
+        :param execute: object BaseExportSchema.TASK[key].EXECUTE.
+
+        :rtype: tuple
+        :returns: (policy, maximum number of parallel runs).
+        """
+        policy = execute.get("OVERLAP") or self.overlap
+        if policy not in OVERLAP:
+            raise ValueError(
+                f"Error. The OVERLAP='{policy}' is incorrect ("
+                f"'OVERLAP' must be in {', '.join(OVERLAP)})"
+            )
+        if policy != "parallel":
+            return policy, 1
+        limit = execute.get("PARALLEL") or self.parallel
+        if not isinstance(limit, int) or limit < 1:
+            raise ValueError(
+                f"Error. The PARALLEL='{limit}' is incorrect ("
+                "'PARALLEL' must be in 1..n)"
+            )
+        return policy, limit
+
+    def admit(self, key: str, execute: dict) -> int | None:
+        """
+        Method applies the overlap policy to the new run of the task.
+        -------------------------------------------------------------
+        :type key: str
+        :param key: task key.
+
+        :type execute: dict
+        :param execute: object BaseExportSchema.TASK[key].EXECUTE.
+
+        :rtype: int | None
+        :returns: run id or None, if the run is not started now.
+        """
+        policy, limit = self.get_overlap(execute)
+        replaced = False
+        victims = list()
+        with self.lock:
+            runs = self.active.setdefault(key, dict())
+            if len(runs) >= limit:
+                if policy in ("skip", "parallel"):
+                    self.skipped[key] = self.skipped.get(key, 0) + 1
+                    self.logger.warning(
+                        f"Task '{key}' skipped, the previous run is "
+                        f"in progress (skipped: {self.skipped[key]})"
+                    )
+                    return None
+                if policy == "queue":
+                    if key in self.pending:
+                        self.coalesced[key] = (
+                            self.coalesced.get(key, 0) + 1
+                        )
+                    self.pending[key] = execute
+                    self.logger.info(
+                        f"Task '{key}' queued, the previous run is in "
+                        f"progress (coalesced: {self.coalesced.get(key, 0)})"
+                    )
+                    return None
+                # replace
+                replaced = True
+                self.replaced[key] = self.replaced.get(key, 0) + 1
+                for runId, pid in runs.items():
+                    self.cancelled.add(runId)
+                    if pid is not None:
+                        victims.append(pid)
+            runId = next(self.counter)
+            runs[runId] = None
+        if replaced:
+            self.logger.warning(
+                f"Task '{key}' replaced, the previous run is killed "
+                f"(replaced: {self.replaced[key]})"
+            )
+        for pid in victims:
+            self.terminate(pid)
+        return runId
+
+    def attach(self, key: str, runId: int, pid: int) -> None:
+        """Method registers the process id of the current command."""
+        with self.lock:
+            runs = self.active.get(key)
+            if runs is not None and runId in runs:
+                runs[runId] = pid
+            self.alive[pid] = None
+            cancelled = runId in self.cancelled
+        if cancelled:
+            self.terminate(pid)
+
+    def detach(self, key: str, runId: int) -> None:
+        """
+        Method unregisters the process id of the reaped command.
+        --------------------------------------------------------
+        The delayed SIGKILL is cancelled, the process group id can be \
+            reused by the system after the command has been waited for.
+
+        :type key: str
+        :param key: task key.
+
+        :type runId: int
+        :param runId: run id returned by admit().
+        """
+        with self.lock:
+            runs = self.active.get(key, dict())
+            pid = runs.get(runId)
+            if pid is None:
+                return
+            runs[runId] = None
+            timer = self.alive.pop(pid, None)
+        if timer is not None:
+            timer.cancel()
+
+    def finished(self, key: str, runId: int) -> None:
+        """Method unregisters the run and starts the queued one."""
+        with self.lock:
+            runs = self.active.get(key, dict())
+            runs.pop(runId, None)
+            if not runs:
+                self.active.pop(key, None)
+            self.cancelled.discard(runId)
+            execute = self.pending.pop(key, None)
+        if execute is not None:
+            self.submit(key, execute)
+
+    def terminate(self, pid: int) -> None:
+        """Method kills the process group: SIGTERM, then SIGKILL."""
+        with self.lock:
+            if pid not in self.alive or self.alive[pid] is not None:
+                return
+            killProcessGroup(pid, signal.SIGTERM)
+            timer = threading.Timer(
+                self.killDelay,
+                self.kill,
+                args=(pid,)
+            )
+            timer.daemon = True
+            self.alive[pid] = timer
+            timer.start()
+
+    def kill(self, pid: int) -> None:
+        """Method sends SIGKILL to the process group not yet reaped."""
+        with self.lock:
+            if pid in self.alive:
+                killProcessGroup(pid, signal.SIGKILL)
+
+    def get_timeout(self, execute: dict) -> float | None:
+        """
+        Method returns the task execution time limit.
+        ---------------------------------------------
+        :type execute: dict
+        :param execute: object BaseExportSchema.TASK[key].EXECUTE.
+
+        :rtype: float
+        :returns: TIMEOUT of the task or of the executor, None - no limit.
+        """
+        timeout = execute.get("TIMEOUT")
+        if timeout is None:
+            timeout = self.timeout
+        if not timeout:
+            return None
+        return timeout
+
+    def remaining(
+        self,
+        runId: int,
+        startTime: float,
+        timeout: float | None
+    ) -> float | None:
+        """Method returns the time limit of the next task command."""
+        if runId in self.cancelled:
+            raise InterruptedError("replaced by the new run")
+        if timeout is None:
+            return None
+        left = timeout - (time.monotonic() - startTime)
+        if left <= 0:
+            raise InterruptedError(
+                f"TIMEOUT {timeout}s is over, the next command "
+                "is not started"
+            )
+        return left
+
+    def timed_out(self, key: str, timeout: float, cmd: str) -> None:
+        """Method for logging the task timeout."""
+        self.logger.warning(
+            f"Task '{key}' timed out after {timeout}s, "
+            f"process group killed: {cmd}"
+        )
+
+    def execute(
+        self,
+        key: str,
+        runId: int,
+        shell: List[str],
+        timeout: float = None
+    ) -> None:
+        """
+        Method for executing the task commands in the listed order.
+        -----------------------------------------------------------
+        :type key: str
+        :param key: task key.
+
+        :type runId: int
+        :param runId: run id returned by admit().
+
+        :type shell: list
+        :param shell: object BaseExportSchema.TASK[key].EXECUTE.SHELL.
+
+        :type timeout: float
+        :param timeout: execution time limit (sec) of all task commands.
+        """
+        startTime = time.monotonic()
+        try:
+            for cmd in shell:
+                try:
+                    out = runShellCmd(
+                        cmd,
+                        self.remaining(runId, startTime, timeout),
+                        self.killDelay,
+                        lambda pid: self.attach(key, runId, pid)
+                    )
+                finally:
+                    self.detach(key, runId)
+                self.logger.info(
+                    f"shell:\n{out}"
+                )
+        except TimeoutError as err:
+            self.timed_out(key, timeout, err)
+        except InterruptedError as err:
+            self.logger.warning(
+                f"Task '{key}' stopped: {err}"
+            )
+        except Exception as err:
+            self.logger.error(
+                f"Task '{key}' failed: {err}"
+            )
+        finally:
+            self.logger.info(
+                f"Task '{key}' completed: "
+                f"{time.monotonic() - startTime:.3f}s"
+            )
+            self.finished(key, runId)
+
+    @abc.abstractmethod
+    def submit(self, key: str, execute: dict, runs: int = 1) -> None:
+        """Method for transferring the task to execution."""
+
+    @abc.abstractmethod
+    def shutdown(self, wait: bool = True) -> None:
+        """Method for stopping the executor."""
+
+
+class ThreadExecutor(BaseExecutor):
+    """Class for executing task commands in a bounded thread pool."""
+
+    def __init__(
+        self,
+        logger: logging,
+        workers: int = 4,
+        timeout: float = 0,
+        killDelay: float = 5,
+        overlap: str = "queue",
+        parallel: int = 1
+    ) -> None:
+        """
+        ThreadExecutor constructor object for the worker thread pool.
+        -------------------------------------------------------------
+        :type logger: object
+        :param logger: getLogger() function reference.
+
+        :type workers: int
+        :param workers: number of worker threads.
+
+        :type timeout: float
+        :param timeout: default task execution time limit (sec).
+
+        :type killDelay: float
+        :param killDelay: time (sec) between SIGTERM and SIGKILL.
+
+        :type overlap: str
+        :param overlap: default overlap policy of the tasks.
+
+        :type parallel: int
+        :param parallel: default limit of parallel runs of one task.
+        """
+        super().__init__(
+            logger, workers, timeout, killDelay, overlap, parallel
+        )
+        self.pool = ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix="shellTaskEnvWorker"
+        )
+
+    def submit(self, key: str, execute: dict, runs: int = 1) -> None:
+        """
+        Method for transferring the task to the thread pool.
+        ----------------------------------------------------
+        :type key: str
+        :param key: task key.
+
+        :type execute: dict
+        :param execute: object BaseExportSchema.TASK[key].EXECUTE.
+
+        :type runs: int
+        :param runs: number of consecutive runs of the task commands.
+        """
+        runId = self.admit(key, execute)
+        if runId is None:
+            return
+        self.pool.submit(
+            self.execute,
+            key,
+            runId,
+            list(execute["SHELL"]) * runs,
+            self.get_timeout(execute)
+        )
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Method stops the pool, queued tasks are cancelled."""
+        self.pool.shutdown(wait=wait, cancel_futures=True)
+
+
+class AsyncExecutor(BaseExecutor):
+    """Class for executing task commands on the asyncio event loop."""
+
+    def __init__(
+        self,
+        logger: logging,
+        workers: int = 4,
+        timeout: float = 0,
+        killDelay: float = 5,
+        overlap: str = "queue",
+        parallel: int = 1
+    ) -> None:
+        """
+        AsyncExecutor constructor object for the event loop thread.
+        -----------------------------------------------------------
+        All commands are asyncio subprocesses of a single event loop \
+            thread, their output is logged line by line.
+
+        :type logger: object
+        :param logger: getLogger() function reference.
+
+        :type workers: int
+        :param workers: number of tasks executed concurrently.
+
+        :type timeout: float
+        :param timeout: default task execution time limit (sec).
+
+        :type killDelay: float
+        :param killDelay: time (sec) between SIGTERM and SIGKILL.
+
+        :type overlap: str
+        :param overlap: default overlap policy of the tasks.
+
+        :type parallel: int
+        :param parallel: default limit of parallel runs of one task.
+        """
+        super().__init__(
+            logger, workers, timeout, killDelay, overlap, parallel
+        )
+        self.loop = asyncio.new_event_loop()
+        self.semaphore = asyncio.Semaphore(workers)
+        self.thread = threading.Thread(
+            target=self.run_loop,
+            name="shellTaskEnvLoop",
+            daemon=True
+        )
+        self.thread.start()
+
+    def run_loop(self) -> None:
+        """Method runs the event loop in the executor thread."""
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    async def pipe(self, key: str, proc: asyncio.subprocess.Process) -> int:
+        """
+        Method for logging the command output line by line.
+        ---------------------------------------------------
+        The output is read in chunks, the line longer than PIPE_LIMIT \
+            is logged in parts.
+        """
+        tail = b""
+        while chunk := await proc.stdout.read(PIPE_CHUNK):
+            lines = (tail + chunk).split(b"\n")
+            tail = lines.pop()
+            while len(tail) >= PIPE_LIMIT:
+                lines.append(tail[:PIPE_LIMIT])
+                tail = tail[PIPE_LIMIT:]
+            for line in lines:
+                self.logger.info(
+                    f"shell[{key}]: {line.decode(errors='replace').rstrip()}"
+                )
+        if tail:
+            self.logger.info(
+                f"shell[{key}]: {tail.decode(errors='replace').rstrip()}"
+            )
+        return await proc.wait()
+
+    async def stream(
+        self,
+        key: str,
+        runId: int,
+        cmd: str,
+        timeout: float = None
+    ) -> int:
+        """
+        Method for executing the command with streaming output.
+        -------------------------------------------------------
+        :type key: str
+        :param key: task key.
+
+        :type runId: int
+        :param runId: run id returned by admit().
+
+        :type cmd: str
+        :param cmd: shell command.
+
+        :type timeout: float
+        :param timeout: execution time limit (sec), None - no limit.
+
+        :rtype: int
+        :returns: command exit code.
+        """
+        proc = await asyncio.create_subprocess_shell(
+            cmd,
+            stdout=asyncio.subprocess.PIPE,
+            start_new_session=True
+        )
+        self.attach(key, runId, proc.pid)
+        try:
+            return await asyncio.wait_for(self.pipe(key, proc), timeout)
+        except asyncio.TimeoutError:
+            await self.killed(proc)
+            raise TimeoutError(cmd)
+        except Exception:
+            await self.killed(proc)
+            raise
+        finally:
+            self.detach(key, runId)
+
+    async def killed(self, proc: asyncio.subprocess.Process) -> None:
+        """Method kills the process group and waits for the command."""
+        killProcessGroup(proc.pid, signal.SIGTERM)
+        try:
+            await asyncio.wait_for(proc.wait(), self.killDelay)
+        except asyncio.TimeoutError:
+            killProcessGroup(proc.pid, signal.SIGKILL)
+            await proc.wait()
+
+    async def execute_async(
+        self,
+        key: str,
+        runId: int,
+        shell: List[str],
+        timeout: float = None
+    ) -> None:
+        """Method for executing the task commands in the listed order."""
+        startTime = time.monotonic()
+        try:
+            async with self.semaphore:
+                # The waiting for the worker is not counted in TIMEOUT.
+                startTime = time.monotonic()
+                for cmd in shell:
+                    await self.stream(
+                        key,
+                        runId,
+                        cmd,
+                        self.remaining(runId, startTime, timeout)
+                    )
+        except TimeoutError as err:
+            self.timed_out(key, timeout, err)
+        except InterruptedError as err:
+            self.logger.warning(
+                f"Task '{key}' stopped: {err}"
+            )
+        except Exception as err:
+            self.logger.error(
+                f"Task '{key}' failed: {err}"
+            )
+        finally:
+            self.logger.info(
+                f"Task '{key}' completed: "
+                f"{time.monotonic() - startTime:.3f}s"
+            )
+            self.finished(key, runId)
+
+    def submit(self, key: str, execute: dict, runs: int = 1) -> None:
+        """
+        Method for transferring the task to the event loop.
+        ---------------------------------------------------
+        :type key: str
+        :param key: task key.
+
+        :type execute: dict
+        :param execute: object BaseExportSchema.TASK[key].EXECUTE.
+
+        :type runs: int
+        :param runs: number of consecutive runs of the task commands.
+        """
+        runId = self.admit(key, execute)
+        if runId is None:
+            return
+        asyncio.run_coroutine_threadsafe(
+            self.execute_async(
+                key,
+                runId,
+                list(execute["SHELL"]) * runs,
+                self.get_timeout(execute)
+            ),
+            self.loop
+        )
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Method stops the event loop thread."""
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        if wait:
+            self.thread.join()
+
+
+class StartLimiter(object):
+    """Class for limiting the number of task starts per second."""
+
+    def __init__(self, rate: float = 0) -> None:
+        """
+        StartLimiter constructor object of the token bucket.
+        ----------------------------------------------------
+        The bucket holds the starts of one second, the tokens are \
+            added continuously.
+
+        :type rate: float
+        :param rate: maximum starts per second, 0 - unlimited.
+        """
+        self.rate = rate
+        self.tokens: float = rate
+        self.last: float = time.monotonic()
+
+    def refill(self, worktime: float) -> None:
+        """Method adds the tokens accumulated since the last call."""
+        self.tokens = min(
+            self.rate,
+            self.tokens + (worktime - self.last) * self.rate
+        )
+        self.last = worktime
+
+    def take(self, worktime: float) -> bool:
+        """
+        Method takes the token of one start.
+        ------------------------------------
+        :type worktime: float
+        :param worktime: current monotonic timestamp.
+
+        :rtype: bool
+        :returns: True, if the task can be started now.
+        """
+        if not self.rate:
+            return True
+        self.refill(worktime)
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+    def deadline(self, worktime: float) -> float:
+        """Method returns the monotonic time of the next token."""
+        if not self.rate:
+            return worktime
+        self.refill(worktime)
+        return worktime + max(1 - self.tokens, 0) / self.rate
+
+
+ENGINES = {
+    "thread": ThreadExecutor,
+    "asyncio": AsyncExecutor,
+}
+
+
+def getExecutor(
+    logger: logging,
+    data: dict
+) -> BaseExecutor:
+    """
+    Function to get the executor object.
+    ------------------------------------
+    :type logger: object
+    :param logger: getLogger() function reference.
+
+    :type data: dict
+    :param data: object BaseExportSchema.EXECUTOR.
+
+    :rtype: object
+    :returns: BaseExecutor.
+    """
+    engine = data["ENGINE"]
+    if engine not in ENGINES:
+        raise TypeError(
+            f"Invalid executor engine '{engine}'. "
+            f"Can be {', '.join(repr(x) for x in ENGINES)}."
+        )
+    return ENGINES[engine](
+        logger=logger,
+        workers=data["WORKERS"],
+        timeout=data["TIMEOUT"],
+        killDelay=data["KILL_DELAY"],
+        overlap=data["OVERLAP"],
+        parallel=data["PARALLEL"]
+    )
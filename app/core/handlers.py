@@ -1,19 +1,505 @@
 # -*- coding: utf-8 -*-
 import os
+import bz2
+import bisect
+import gzip
+import json
+import lzma
 import time
 import shutil
 import tarfile
 import zipfile
+import hashlib
+import functools
+import multiprocessing
+from collections import deque
+from concurrent.futures import (
+    Future,
+    ProcessPoolExecutor
+)
 from datetime import datetime
 from typing import (
+    BinaryIO,
+    Callable,
+    Deque,
     List,
-    Dict
+    Dict,
+    Tuple
 )
 
 
+class ParallelWriter(object):
+    """Class of the file object that compresses the chunks in processes."""
+
+    def __init__(
+        self,
+        fileobj: BinaryIO,
+        compress: Callable[[bytes], bytes],
+        workers: int,
+        chunk: int
+    ) -> None:
+        """
+        ParallelWriter constructor object for the parallel compression.
+        ---------------------------------------------------------------
+        The data is cut into chunks, each chunk is compressed by one \
+            process into a separate member (gz, bz2) or stream (xz). \
+                The members are written in the order of the data, the \
+                    result is read as one archive.
+
+        :type fileobj: BinaryIO
+        :param fileobj: archive file.
+
+        :type compress: Callable
+        :param compress: compression function of the chunk.
+
+        :type workers: int
+        :param workers: number of processes.
+
+        :type chunk: int
+        :param chunk: size of the chunk (bytes).
+        """
+        self.fileobj = fileobj
+        self.compress = compress
+        self.chunk = chunk
+        self.buffer = bytearray()
+        self.pending: Deque[Future] = deque()
+        # Compressed chunks waiting for the write, limits the memory.
+        self.limit = 2 * workers
+        self.size = 0
+        self.pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+
+    def submit(self, data: bytes) -> None:
+        """Method sends the chunk to the pool and writes the ready ones."""
+        self.pending.append(self.pool.submit(self.compress, data))
+        while len(self.pending) > self.limit:
+            self.fileobj.write(self.pending.popleft().result())
+
+    def write(self, data: bytes) -> int:
+        """Method adds the data, full chunks are sent to the pool."""
+        self.buffer += data
+        self.size += len(data)
+        while len(self.buffer) >= self.chunk:
+            self.submit(bytes(self.buffer[:self.chunk]))
+            del self.buffer[:self.chunk]
+        return len(data)
+
+    def close(self) -> None:
+        """Method compresses the rest of the data and stops the pool."""
+        try:
+            if self.buffer:
+                self.submit(bytes(self.buffer))
+                self.buffer.clear()
+            while self.pending:
+                self.fileobj.write(self.pending.popleft().result())
+        finally:
+            self.abort()
+
+    def abort(self) -> None:
+        """Method drops the chunks in progress and stops the pool."""
+        self.pending.clear()
+        self.pool.shutdown(cancel_futures=True)
+
+
+class ArchManifest(object):
+    """Class of the index of the packed log files."""
+
+    SUFFIX = ".manifest.json"
+    # End of the packed data compared before packing the appended data.
+    WINDOW = 65536
+
+    @classmethod
+    def digest(
+        cls,
+        pathFile: str,
+        end: int
+    ) -> str:
+        """
+        Method returns the hash of the packed data end.
+        -----------------------------------------------
+        Only the last WINDOW bytes are read, so the check of the \
+            appended file does not depend on the file size.
+
+        :type pathFile: str
+        :param pathFile: path to the log file.
+
+        :type end: int
+        :param end: size of the packed data (bytes).
+
+        :rtype: str
+        :returns: blake2b hex digest.
+        """
+        start = max(end - cls.WINDOW, 0)
+        with open(pathFile, "rb") as file:
+            file.seek(start)
+            data = file.read(end - start)
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    def __init__(self, pathfile: str) -> None:
+        """
+        ArchManifest constructor object of the packed files.
+        ----------------------------------------------------
+        The manifest keeps the path, size, mtime, inode and hash of \
+            every packed file. A damaged manifest is ignored and all \
+                files are packed again.
+
+        :type pathfile: str
+        :param pathfile: path to the manifest file.
+        """
+        self.pathfile = pathfile
+        self.files: Dict[str, dict] = dict()
+        # Files of the last changes() call: {path: os.stat_result}.
+        self.seen: Dict[str, os.stat_result] = dict()
+        try:
+            with open(pathfile, "r") as file:
+                self.files = json.load(file)["files"]
+        except FileNotFoundError:
+            pass
+        except (ValueError, KeyError, TypeError):
+            self.files = dict()
+
+    def changes(
+        self,
+        fromDir: str,
+        toDir: str
+    ) -> List[Tuple[str, str, int, int]]:
+        """
+        Method returns the new and changed data of the log files.
+        ---------------------------------------------------------
+        If the file keeps its inode, has grown and the end of the \
+            packed data is the same, only the appended data is \
+                returned. The file of the same size is unchanged only \
+                    with the same mtime. Otherwise the file is packed \
+                        whole.
+
+        :type fromDir: str
+        :param fromDir: path to the archiving directory.
+
+        :type toDir: str
+        :param toDir: path to the directory of the archives, skipped.
+
+        :rtype: list
+        :returns: [(path, arcname, offset, size), ...].
+        """
+        out = list()
+        self.seen = dict()
+        skipDir = os.path.realpath(toDir)
+        for root, dirs, files in os.walk(fromDir):
+            dirs[:] = sorted(
+                x for x in dirs
+                if os.path.realpath(os.path.join(root, x)) != skipDir
+            )
+            for name in sorted(files):
+                pathFile = os.path.join(root, name)
+                try:
+                    stat = os.stat(pathFile)
+                except FileNotFoundError:
+                    continue
+                self.seen[pathFile] = stat
+                record = self.files.get(pathFile)
+                offset = 0
+                if record is not None and record["inode"] == stat.st_ino:
+                    if (
+                        stat.st_size == record["size"] and
+                        stat.st_mtime == record["mtime"]
+                    ):
+                        continue
+                    if (
+                        stat.st_size > record["size"] and
+                        self.digest(pathFile, record["size"]) ==
+                        record["hash"]
+                    ):
+                        offset = record["size"]
+                arcname = os.path.relpath(pathFile, fromDir)
+                if offset:
+                    arcname = f"{arcname}+{offset}"
+                out.append((pathFile, arcname, offset, stat.st_size))
+        return out
+
+    def commit(
+        self,
+        changes: List[Tuple[str, str, int, int]]
+    ) -> None:
+        """
+        Method writes the packed files into the manifest.
+        -------------------------------------------------
+        The files that no longer exist are removed from the manifest. \
+            The file is replaced atomically.
+
+        :type changes: list
+        :param changes: [(path, arcname, offset, size), ...] of changes().
+        """
+        files = dict()
+        for pathFile, stat in self.seen.items():
+            record = self.files.get(pathFile)
+            if record is not None:
+                record["mtime"] = stat.st_mtime
+                files[pathFile] = record
+        for pathFile, _, _, size in changes:
+            files[pathFile] = {
+                "size": size,
+                "mtime": self.seen[pathFile].st_mtime,
+                "inode": self.seen[pathFile].st_ino,
+                "hash": self.digest(pathFile, size)
+            }
+        self.files = files
+        tmpfile = f"{self.pathfile}.tmp"
+        with open(tmpfile, "w") as file:
+            json.dump({"files": files}, file, indent=4)
+        os.replace(tmpfile, self.pathfile)
+
+
+class ArchCatalog(object):
+    """Class of the cached list of the archives in the directory."""
+
+    NAME = ".catalog.json"
+    # Interval (sec) of the directory reconciliation with os.scandir().
+    RECONCILE = 86400
+
+    @classmethod
+    def skip(cls, filename: str) -> bool:
+        """Method returns True for the service files of the directory."""
+        return (
+            filename == cls.NAME or
+            filename.endswith(ArchManifest.SUFFIX) or
+            filename.endswith(".tmp")
+        )
+
+    def __init__(self, dirpath: str) -> None:
+        """
+        ArchCatalog constructor object of the archives directory.
+        ---------------------------------------------------------
+        The catalog keeps (mtime, name, size) of every archive sorted \
+            by mtime, so the retention does not stat the archives. \
+                The directory is scanned only if the catalog is \
+                    missing, damaged or older than RECONCILE.
+
+        :type dirpath: str
+        :param dirpath: path to the directory of the archives.
+        """
+        self.dirpath = dirpath
+        self.pathfile = os.path.join(dirpath, self.NAME)
+        self.archives: List[Tuple[float, str, int]] = list()
+        self.reconciled: float = 0
+        try:
+            with open(self.pathfile, "r") as file:
+                data = json.load(file)
+            self.archives = sorted(
+                (float(mtime), str(name), int(size))
+                for name, size, mtime in data["archives"]
+            )
+            self.reconciled = float(data["reconciled"])
+        except FileNotFoundError:
+            pass
+        except (ValueError, KeyError, TypeError):
+            self.reconciled = 0
+        if time.time() - self.reconciled >= self.RECONCILE:
+            self.reconcile()
+
+    def reconcile(self) -> None:
+        """Method rebuilds the catalog from the directory."""
+        archives = list()
+        with os.scandir(self.dirpath) as entries:
+            for entry in entries:
+                if self.skip(entry.name) or not entry.is_file():
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                archives.append((stat.st_mtime, entry.name, stat.st_size))
+        self.archives = sorted(archives)
+        self.reconciled = time.time()
+        self.commit()
+
+    def add(self, pathfile: str) -> None:
+        """
+        Method adds the created archive to the catalog.
+        -----------------------------------------------
+        :type pathfile: str
+        :param pathfile: path to the archive in the directory.
+        """
+        stat = os.stat(pathfile)
+        name = os.path.basename(pathfile)
+        self.archives = [x for x in self.archives if x[1] != name]
+        bisect.insort(self.archives, (stat.st_mtime, name, stat.st_size))
+        self.commit()
+
+    def expired(
+        self,
+        days: float = None,
+        count: int = 0,
+        size: int = 0
+    ) -> List[Tuple[float, str, int]]:
+        """
+        Method returns the oldest archives outside the retention.
+        ---------------------------------------------------------
+        :type days: float
+        :param days: maximum age of the archives, 0 - all archives \
+            older than now, None - not limited.
+
+        :type count: int
+        :param count: maximum number of the archives, 0 - not limited.
+
+        :type size: int
+        :param size: maximum size of the archives (bytes), \
+            0 - not limited.
+
+        :rtype: list
+        :returns: [(mtime, name, size), ...] from the oldest one.
+        """
+        end = 0
+        if days is not None:
+            end = bisect.bisect_left(
+                self.archives,
+                (time.time() - days * 86400,)
+            )
+        if count:
+            end = max(end, len(self.archives) - count)
+        if size:
+            total = sum(x[2] for x in self.archives[end:])
+            while end < len(self.archives) and total > size:
+                total -= self.archives[end][2]
+                end += 1
+        return self.archives[:end]
+
+    def remove(
+        self,
+        archives: List[Tuple[float, str, int]]
+    ) -> List[str]:
+        """
+        Method deletes the archives and removes them from the catalog.
+        --------------------------------------------------------------
+        :type archives: list
+        :param archives: [(mtime, name, size), ...] of expired().
+
+        :rtype: list
+        :returns: paths of the deleted archives.
+        """
+        out = list()
+        for _, name, _ in archives:
+            pathfile = os.path.join(self.dirpath, name)
+            try:
+                os.remove(pathfile)
+            except FileNotFoundError:
+                continue
+            out.append(pathfile)
+        if archives:
+            self.archives = self.archives[len(archives):]
+            self.commit()
+        return out
+
+    def commit(self) -> None:
+        """Method writes the catalog, the file is replaced atomically."""
+        tmpfile = f"{self.pathfile}.tmp"
+        with open(tmpfile, "w") as file:
+            json.dump(
+                {
+                    "reconciled": self.reconciled,
+                    "archives": [
+                        [name, size, mtime]
+                        for mtime, name, size in self.archives
+                    ]
+                },
+                file
+            )
+        os.replace(tmpfile, self.pathfile)
+
+
 class LogArch(object):
     """Class for archiving log files."""
 
+    # Compression of the tar archive: (function, level argument).
+    CODECS = {
+        "gz": (gzip.compress, "compresslevel"),
+        "bz2": (bz2.compress, "compresslevel"),
+        "xz": (lzma.compress, "preset")
+    }
+    # Size of the chunk compressed by one process (bytes).
+    CHUNK = 16 * 1024 * 1024
+
+    @staticmethod
+    def throughput(
+        out: dict,
+        size: int,
+        startTime: float
+    ) -> dict:
+        """
+        Method adds the size and the speed of the archiving.
+        ----------------------------------------------------
+        :type out: dict
+        :param out: result of the archiving.
+
+        :type size: int
+        :param size: size of the packed data (bytes).
+
+        :type startTime: float
+        :param startTime: monotonic time of the start.
+
+        :rtype: dict
+        :returns: out with "bytes", "seconds" and "mb_s".
+        """
+        seconds = time.monotonic() - startTime
+        out.update(
+            {
+                "bytes": size,
+                "seconds": round(seconds, 3),
+                "mb_s": round(size / 1048576 / seconds, 2)
+                if seconds else 0.0
+            }
+        )
+        return out
+
+    @staticmethod
+    def tar_part(
+        tarArch: tarfile.TarFile,
+        pathFile: str,
+        arcname: str,
+        offset: int,
+        size: int
+    ) -> int:
+        """
+        Method adds the data of the file from offset to size.
+        -----------------------------------------------------
+        :rtype: int
+        :returns: size of the packed data (bytes).
+        """
+        tarinfo = tarArch.gettarinfo(pathFile, arcname)
+        tarinfo.size = size - offset
+        with open(pathFile, "rb") as file:
+            file.seek(offset)
+            tarArch.addfile(tarinfo, file)
+        return tarinfo.size
+
+    @staticmethod
+    def zip_part(
+        zipf: zipfile.ZipFile,
+        pathFile: str,
+        arcname: str,
+        offset: int,
+        size: int
+    ) -> int:
+        """
+        Method adds the data of the file from offset to size.
+        -----------------------------------------------------
+        :rtype: int
+        :returns: size of the packed data (bytes).
+        """
+        remain = size - offset
+        with open(pathFile, "rb") as file, zipf.open(arcname, "w") as part:
+            file.seek(offset)
+            while remain > 0:
+                data = file.read(min(remain, 1048576))
+                if not data:
+                    raise EOFError(
+                        f"Error. File '{pathFile}' was truncated."
+                    )
+                part.write(data)
+                remain -= len(data)
+        return size - offset
+
     @classmethod
     def targz(
         cls,
@@ -21,39 +507,84 @@ class LogArch(object):
         fromDir: str,
         toDir: str,
         typeArch: str,
-        formatDt: str
+        formatDt: str,
+        level: int = 0,
+        workers: int = 0,
+        changes: List[Tuple[str, str, int, int]] = None
     ) -> Dict[str, str]:
+        """
+        Method tar archiving with gz, bz2 or xz compression.
+        ----------------------------------------------------
+        If workers > 1, the tar stream is compressed by chunks in \
+            the process pool. If changes are passed, only they are \
+                packed instead of the whole directory.
+        """
         out = dict()
         packed = list()
-        """Method targz archiving."""
-        try:
-            frmtDt = datetime.now().strftime(formatDt)
-            save_arch_name = (
-                f"{toDir}/{archName}_{frmtDt}.tar.{typeArch}"
-            )
-            with tarfile.open(
-                save_arch_name, "w:gz"
-            ) as tarGz:
-                for file in os.listdir(fromDir):
-                    pathFile = f"{fromDir}/{file}"
-                    if pathFile != toDir:
-                        tarGz.add(
-                            pathFile,
-                            arcname=os.path.relpath(
-                                pathFile, fromDir
+        sizes = [0]
+        startTime = time.monotonic()
+        compress, argLevel = cls.CODECS[typeArch]
+        kwargs = {argLevel: level} if level else dict()
+
+        def count(tarinfo: tarfile.TarInfo) -> tarfile.TarInfo:
+            """Function counts the size of the packed files."""
+            sizes[0] += tarinfo.size
+            return tarinfo
+
+        frmtDt = datetime.now().strftime(formatDt)
+        save_arch_name = (
+            f"{toDir}/{archName}_{frmtDt}.tar.{typeArch}"
+        )
+        with open(save_arch_name, "wb") as fileArch:
+            writer = None
+            if workers > 1:
+                writer = ParallelWriter(
+                    fileArch,
+                    functools.partial(compress, **kwargs),
+                    workers,
+                    cls.CHUNK
+                )
+                tarArch = tarfile.open(fileobj=writer, mode="w|")
+            else:
+                tarArch = tarfile.open(
+                    fileobj=fileArch,
+                    mode=f"w:{typeArch}",
+                    **kwargs
+                )
+            try:
+                with tarArch:
+                    if changes is not None:
+                        for pathFile, arcname, offset, end in changes:
+                            sizes[0] += cls.tar_part(
+                                tarArch, pathFile, arcname, offset, end
                             )
-                        )
-                        packed.append(pathFile)
+                            packed.append(pathFile)
+                    else:
+                        for file in os.listdir(fromDir):
+                            pathFile = f"{fromDir}/{file}"
+                            if pathFile != toDir:
+                                tarArch.add(
+                                    pathFile,
+                                    arcname=os.path.relpath(
+                                        pathFile, fromDir
+                                    ),
+                                    filter=count
+                                )
+                                packed.append(pathFile)
+            except BaseException:
+                if writer is not None:
+                    writer.abort()
+                raise
+            if writer is not None:
+                writer.close()
 
-            out.update(
-                {
-                    "packed": packed,
-                    "arch_name": save_arch_name
-                }
-            )
-            return out
-        except Exception as err:
-            raise err
+        out.update(
+            {
+                "packed": packed,
+                "arch_name": save_arch_name
+            }
+        )
+        return cls.throughput(out, sizes[0], startTime)
 
     @classmethod
     def zipp(
@@ -62,20 +593,31 @@ class LogArch(object):
         fromDir: str,
         toDir: str,
         typeArch: str,
-        formatDt: str
-    ) -> None:
-        """Method zip archiving."""
+        formatDt: str,
+        level: int = 0,
+        changes: List[Tuple[str, str, int, int]] = None
+    ) -> Dict[str, str]:
+        """Method zip archiving, changes - see targz()."""
         out = dict()
         packed = list()
-        try:
-            frmtDt = datetime.now().strftime(formatDt)
-            save_arch_name = (
-                f"{toDir}/{archName}_{frmtDt}.{typeArch}"
-            )
-            with zipfile.ZipFile(
-                save_arch_name, "w",
-                zipfile.ZIP_DEFLATED
-            ) as zipf:
+        size = 0
+        startTime = time.monotonic()
+        frmtDt = datetime.now().strftime(formatDt)
+        save_arch_name = (
+            f"{toDir}/{archName}_{frmtDt}.{typeArch}"
+        )
+        with zipfile.ZipFile(
+            save_arch_name, "w",
+            zipfile.ZIP_DEFLATED,
+            compresslevel=level or None
+        ) as zipf:
+            if changes is not None:
+                for pathFile, arcname, offset, end in changes:
+                    size += cls.zip_part(
+                        zipf, pathFile, arcname, offset, end
+                    )
+                    packed.append(pathFile)
+            else:
                 for file in os.listdir(fromDir):
                     pathFile = f"{fromDir}/{file}"
                     if pathFile != toDir:
@@ -86,16 +628,16 @@ class LogArch(object):
                             )
                         )
                         packed.append(pathFile)
+                        if os.path.isfile(pathFile):
+                            size += os.path.getsize(pathFile)
 
-            out.update(
-                {
-                    "packed": packed,
-                    "arch_name": save_arch_name
-                }
-            )
-            return out
-        except Exception as err:
-            raise err
+        out.update(
+            {
+                "packed": packed,
+                "arch_name": save_arch_name
+            }
+        )
+        return cls.throughput(out, size, startTime)
 
     def __init__(
         self,
@@ -103,7 +645,11 @@ class LogArch(object):
         toDir: str,
         archName: str,
         typeArch: str,
-        formatDt: str = "%Y-%m-%d_%H:%M:%S"
+        formatDt: str = "%Y-%m-%d_%H:%M:%S",
+        level: int = 0,
+        workers: int = 0,
+        incremental: bool = False,
+        files: List[str] = None
     ) -> None:
         """
         LogArch constructor that archives log files.
@@ -119,35 +665,89 @@ class LogArch(object):
         :param archName: Archived directory name
 
         :type typeArch: str
-        :param typeArch: Archive type "zip" or "gz", default name "gz"
+        :param typeArch: Archive type "gz", "bz2", "xz" or "zip", \
+            default name "gz"
 
         :type formatDt: str
         :param formatDt: The default date and time format \
             for the archive directory is '%Y-%m-%d_%H:%M:%S'.
+
+        :type level: int
+        :param level: compression level 1..9, 0 - default level.
+
+        :type workers: int
+        :param workers: number of compression processes of the tar \
+            archive, 0 or 1 - in the current process.
+
+        :type incremental: bool
+        :param incremental: pack only the data that is not in the \
+            manifest of toDir, no archive is created without changes.
+
+        :type files: list
+        :param files: pack only these files of fromDir (the renamed \
+            logfile), the manifest is not used.
         """
         self.out: list[str] = None
+        if typeArch not in self.CODECS and typeArch != "zip":
+            raise TypeError(
+                "Invalid directory archiving type. "
+                "Can be 'gz', 'bz2', 'xz' or 'zip'."
+            )
+        if not isinstance(level, int) or not 0 <= level <= 9:
+            raise ValueError(
+                f"Error. The LEVEL='{level}' is incorrect ("
+                "'LEVEL' must be in 0..9)"
+            )
         if not os.path.isdir(toDir):
             os.makedirs(toDir)
-        if typeArch == "gz":
+        manifest = changes = None
+        if files is not None:
+            changes = [
+                (
+                    pathFile,
+                    os.path.relpath(pathFile, fromDir),
+                    0,
+                    os.path.getsize(pathFile)
+                )
+                for pathFile in files
+            ]
+        elif incremental:
+            manifest = ArchManifest(
+                os.path.join(toDir, archName + ArchManifest.SUFFIX)
+            )
+            changes = manifest.changes(fromDir, toDir)
+            if not changes:
+                manifest.commit(changes)
+                self.out = self.throughput(
+                    {"packed": list(), "arch_name": None},
+                    0,
+                    time.monotonic()
+                )
+                return
+        if typeArch in self.CODECS:
             self.out = self.targz(
                 archName=archName,
                 fromDir=fromDir,
                 toDir=toDir,
                 typeArch=typeArch,
-                formatDt=formatDt
+                formatDt=formatDt,
+                level=level,
+                workers=workers,
+                changes=changes
             )
-        elif typeArch == "zip":
+        else:
             self.out = self.zipp(
                 archName=archName,
                 fromDir=fromDir,
                 toDir=toDir,
                 typeArch=typeArch,
-                formatDt=formatDt
-            )
-        else:
-            raise TypeError(
-                "Invalid directory archiving type. Can be 'gz' or 'zip'."
+                formatDt=formatDt,
+                level=level,
+                changes=changes
             )
+        ArchCatalog(toDir).add(self.out["arch_name"])
+        if manifest is not None:
+            manifest.commit(changes)
 
 
 class TruncateLogFile(object):
@@ -164,19 +764,16 @@ class TruncateLogFile(object):
                 raise FileNotFoundError(
                     f"Error. File '{abspath_filename}' not found"
                 )
-            status = os.system(
-                f"truncate -s 0 {abspath_filename}"
+            os.truncate(abspath_filename, 0)
+            return {
+                "truncate": "ok",
+                "filename": abspath_filename
+            }
+        except OSError as err:
+            raise SystemError(
+                "File cleanup completed with an error. "
+                f"Check file availability. ({err})"
             )
-            if status != 0:
-                raise SystemError(
-                    "File cleanup completed with an error."
-                    "Check file availability."
-                )
-            else:
-                return {
-                    "truncate": "ok",
-                    "filename": abspath_filename
-                }
         except Exception as err:
             raise err
 
@@ -199,6 +796,48 @@ class TruncateLogFile(object):
             self.out = self.truncate(abspath_filename)
 
 
+class RenameLogFile(object):
+    """Class for renaming the active log file before archiving."""
+
+    @classmethod
+    def rename(
+        cls,
+        abspath_filename: str,
+        formatDt: str
+    ) -> Dict[str, str]:
+        """Method renames file, the name gets the date and time suffix."""
+        if not os.path.isfile(abspath_filename):
+            raise FileNotFoundError(
+                f"Error. File '{abspath_filename}' not found"
+            )
+        renamed = f"{abspath_filename}.{datetime.now():{formatDt}}"
+        os.rename(abspath_filename, renamed)
+        return {
+            "rename": "ok",
+            "filename": abspath_filename,
+            "renamed": renamed
+        }
+
+    def __init__(
+        self,
+        abspath_filename: str,
+        formatDt: str = "%Y-%m-%d_%H:%M:%S"
+    ) -> None:
+        """
+        RenameLogFile constructor to rename the log file.
+        -------------------------------------------------
+        The rename is atomic, the handlers of the log file must be \
+            reopened after it (see Logger.reopen()).
+
+        :type abspath_filename: str
+        :param abspath_filename: name of the file to be renamed.
+
+        :type formatDt: str
+        :param formatDt: format of the date and time suffix.
+        """
+        self.out: Dict[str, str] = self.rename(abspath_filename, formatDt)
+
+
 class DeleteLogArch(object):
     """
     Сlass for deleting archive files and directories.
@@ -207,47 +846,76 @@ class DeleteLogArch(object):
     @classmethod
     def delete(
         cls,
-        days: int,
-        dirpath: str
+        days: float | None,
+        dirpath: str,
+        count: int = 0,
+        size: int = 0
     ) -> List[str]:
         """
-        Method for deleting directories and files.
+        Method for deleting the archives outside the retention.
         """
-        out = list()
-        curTime = time.time() - (days * 86400)
-        for filename in os.listdir(dirpath):
-            pathfile = os.path.join(dirpath, filename)
-            if os.path.isfile(pathfile):
-                file_mod_time = os.path.getmtime(pathfile)
-                if file_mod_time < curTime:
-                    os.remove(pathfile)
-                    out.append(pathfile)
-        return out
+        catalog = ArchCatalog(dirpath)
+        return catalog.remove(
+            catalog.expired(days=days, count=count, size=size)
+        )
 
     def __init__(
         self,
         enable: bool,
         dirpath: str,
-        days: int
+        days: float | None,
+        count: int = 0,
+        size: float = 0
     ) -> None:
         """
         DeleteLogArch constructor for deleting archive files and directories.
         ---------------------------------------------------------------------
+        The oldest archives are deleted until all limits are met.
+
         :type enable: bool
         :param enable: on (True) and off (False).
 
         :type dirpath: str
         :param dirpath: path to the directory where the file is located.
 
-        :type days: int
-        :param days: number of days until deletion.
+        :type days: float | None
+        :param days: number of days until deletion, None or a negative \
+            value - not limited.
+
+        :type count: int
+        :param count: number of the kept archives, 0 - not limited.
+
+        :type size: float
+        :param size: total size of the kept archives (MB), \
+            0 - not limited.
         """
         self.out: List[str] = None
         if enable:
+            if days is not None and (
+                isinstance(days, bool) or
+                not isinstance(days, (int, float))
+            ):
+                raise ValueError(
+                    f"Error. The DAYS='{days}' is incorrect ("
+                    "'DAYS' must be a number or null)"
+                )
+            if days is not None and days < 0:
+                days = None
+            for key, value in (
+                ("MAX_COUNT", count),
+                ("MAX_SIZE", size)
+            ):
+                if not isinstance(value, (int, float)) or value < 0:
+                    raise ValueError(
+                        f"Error. The {key}='{value}' is incorrect ("
+                        f"'{key}' must be 0 or more)"
+                    )
             try:
                 self.out = self.delete(
                     dirpath=dirpath,
-                    days=days
+                    days=days,
+                    count=int(count),
+                    size=int(size * 1024 * 1024)
                 )
             except NotADirectoryError as err:
                 raise NotADirectoryError(
@@ -298,3 +966,59 @@ class CopyConfDump(object):
             self.copy(enable, fromFilename, toDirFilename)
         except shutil.ExecError as err:
             raise err
+
+
+class RotateLogFiles(object):
+    """Class for archiving, truncating and deleting log files."""
+
+    def __init__(
+        self,
+        data: dict,
+        renamed: str = None
+    ) -> None:
+        """
+        RotateLogFiles constructor for the log rotation procedure.
+        ----------------------------------------------------------
+        The object does not use the logger, so the procedure can be \
+            executed in a separate process.
+
+        :type data: dict
+        :param data: object BaseExportSchema.LOGROTATION.
+
+        :type renamed: str
+        :param renamed: the logfile renamed by RenameLogFile, only it \
+            is archived and it is removed instead of the truncation.
+        """
+        self.out: Dict[str, Dict[str, str] | List[str]] = dict()
+        startTime = time.monotonic()
+        self.out["arch"] = LogArch(
+            archName=data["ARCH"]["NAME"],
+            fromDir=os.path.dirname(data["LOGFILE"]),
+            toDir=data["ARCH"]["DIR"],
+            typeArch=data["ARCH"]["TYPE"],
+            level=data["ARCH"]["LEVEL"],
+            workers=data["ARCH"]["PARALLEL"],
+            incremental=data["ARCH"]["INCREMENTAL"],
+            files=None if renamed is None else [renamed]
+        ).out
+        if renamed is None:
+            self.out["truncate"] = TruncateLogFile(
+                truncate=data["ARCH"]["TRUNCATE"],
+                abspath_filename=data["LOGFILE"]
+            ).out
+        elif data["ARCH"]["TRUNCATE"]:
+            os.remove(renamed)
+            self.out["truncate"] = {
+                "remove": "ok",
+                "filename": renamed
+            }
+        else:
+            self.out["truncate"] = None
+        self.out["deleted"] = DeleteLogArch(
+            enable=data["DELETE"]["ENABLE"],
+            dirpath=data["ARCH"]["DIR"],
+            days=data["DELETE"]["DAYS"],
+            count=data["DELETE"]["MAX_COUNT"],
+            size=data["DELETE"]["MAX_SIZE"]
+        ).out
+        self.out["seconds"] = round(time.monotonic() - startTime, 3)
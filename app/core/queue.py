@@ -1,44 +1,267 @@
 # -*- coding: utf-8 -*-
+import copy
+import enum
+import heapq
+import itertools
+import threading
 
-class DictQueue:
-    """Class for managing data in a queue."""
 
-    def __init__(self):
-        """DictQueue constructor object for receiving data from the queue."""
+class TaskType(enum.Enum):
+    """Enumeration of the task types of the queue."""
+
+    PLAN = "PlanTask"
+    INTERVAL = "IntervalTask"
+    CRON = "CronTask"
+
+
+class TaskRecord(object):
+    """Class of the queue entry of the task."""
+
+    __slots__ = (
+        "timestamp",
+        "type",
+        "zone",
+        "shell",
+        "conf",
+        "anchor",
+        "runs",
+        "drift"
+    )
+
+    def __init__(
+        self,
+        timestamp: float,
+        type: TaskType,
+        zone: any,
+        shell: list = None,
+        conf: dict = None,
+        anchor: float = None
+    ) -> None:
+        """
+        TaskRecord constructor object of the task time.
+        -----------------------------------------------
+        TaskQueue returns the copies of the record, the changed copy \
+            is stored by update(). The date and time are rendered \
+                from the timestamp only for the log.
+
+        :type timestamp: float
+        :param timestamp: next task time.
+
+        :type type: TaskType
+        :param type: type of DATE_TIME.
+
+        :type zone: object
+        :param zone: ZoneTable or LocalZone of the task.
+
+        :type shell: list
+        :param shell: object BaseExportSchema.TASK[key].EXECUTE.SHELL.
+
+        :type conf: dict
+        :param conf: object BaseExportSchema.LOGROTATION.
+
+        :type anchor: float
+        :param anchor: first time of IntervalTask, None - other tasks.
+        """
+        self.timestamp = timestamp
+        self.type = type
+        self.zone = zone
+        self.shell = shell
+        self.conf = conf
+        self.anchor = anchor
+        self.runs = 0
+        self.drift = 0.0
+
+    @property
+    def date_time(self) -> str:
+        """
+        Method renders the task time in the zone of the task.
+        -----------------------------------------------------
+        :rtype: str
+        :returns: "YYYY-MM-DD HH:MM:SS" or "YYYY-MM-DD HH:MM:SS zone".
+        """
+        dTime = self.zone.to_wall(self.timestamp)
+        if self.zone.name:
+            return f"{dTime} {self.zone.name}"
+        return str(dTime)
+
+    def as_dict(self) -> dict:
+        """Method returns the record in the format of the log."""
+        out = {
+            "DATE_TIME": self.date_time,
+            "TIMESTAMP": self.timestamp,
+            "TYPE": self.type.value
+        }
+        if self.conf is not None:
+            out["CONF_DATA"] = self.conf
+        else:
+            out["SHELL"] = self.shell
+        if self.anchor is not None:
+            out.update(ANCHOR=self.anchor, RUNS=self.runs, DRIFT=self.drift)
+        return out
+
+    def __repr__(self) -> str:
+        """Method returns the record for the log."""
+        return repr(self.as_dict())
+
+
+class TaskQueue(object):
+    """Class for managing data of the queued tasks by key."""
+
+    def __init__(self) -> None:
+        """
+        TaskQueue constructor object for receiving data from the queue.
+        ---------------------------------------------------------------
+        The queue is an index of the task records with TimerHeap of \
+            their deadlines. All methods are protected by the lock, \
+                the records are returned as copies.
+        """
         self.data = dict()
+        self.timers = TimerHeap()
+        self.lock = threading.RLock()
 
     def add(self, key: str | int, value: any) -> None:
         """Method adds data to the queue."""
-        if key not in self.data.keys():
-            self.data[key] = value
+        with self.lock:
+            self.data.setdefault(key, value)
 
     def get(self, key: str | int = None) -> dict:
-        """Method for receiving data from a queue."""
-        if key is None:
-            return self.data
-        else:
-            if key not in self.data.keys():
+        """
+        Method for receiving data from a queue.
+        ---------------------------------------
+        :type key: str | int
+        :param key: key of the data, None - all data.
+
+        :rtype: dict
+        :returns: copy of the value of the key or the snapshot \
+            {key: copy of the value} of all data.
+        """
+        with self.lock:
+            if key is None:
+                return {x: copy.copy(y) for x, y in self.data.items()}
+            if key not in self.data:
                 raise KeyError(
                     f"'{key}' not found."
                 )
-            return self.data[key]
+            return copy.copy(self.data[key])
 
     def update(self, key: str | int, value: any) -> None:
         """Method updates data in the queue."""
-        if key not in self.data.keys():
-            raise KeyError(
-                f"'{key}' not found."
-            )
-        self.data[key] = value
+        with self.lock:
+            if key not in self.data:
+                raise KeyError(
+                    f"'{key}' not found."
+                )
+            self.data[key] = value
 
     def delete(self, key: str | int) -> None:
-        """Method deleted data in the queue."""
-        if key not in self.data:
-            raise KeyError(
-                f"'{key}' not found."
-            )
-        self.data.pop(key, None)
+        """Method deleted data and the deadline in the queue."""
+        with self.lock:
+            if key not in self.data:
+                raise KeyError(
+                    f"'{key}' not found."
+                )
+            del self.data[key]
+            self.timers.discard(key)
+
+    def push(self, key: str | int, timestamp: float) -> None:
+        """Method adds or reschedules the key deadline."""
+        with self.lock:
+            self.timers.push(key, timestamp)
+
+    def push_many(self, items: list[tuple[str | int, float]]) -> None:
+        """Method adds or reschedules many deadlines at once."""
+        with self.lock:
+            self.timers.push_many(items)
+
+    def discard(self, key: str | int) -> None:
+        """Method removes the key deadline, if it exists."""
+        with self.lock:
+            self.timers.discard(key)
+
+    def peek(self) -> float | None:
+        """Method returns the nearest deadline or None."""
+        with self.lock:
+            return self.timers.peek()
+
+    def pop(self, worktime: float) -> str | int | None:
+        """Method returns the key whose deadline has come or None."""
+        with self.lock:
+            return self.timers.pop(worktime)
 
     def size(self) -> int:
         """Method returns the queue size."""
-        return len(self.data.keys())
+        with self.lock:
+            return len(self.data)
+
+    def __contains__(self, key: str | int) -> bool:
+        """Method checks the key without the snapshot of the data."""
+        with self.lock:
+            return key in self.data
+
+
+class TimerHeap(object):
+    """Class for ordering queue keys by the task deadline."""
+
+    def __init__(self) -> None:
+        """
+        TimerHeap constructor object for the min-heap of deadlines.
+        -----------------------------------------------------------
+        Outdated heap entries are not removed on reschedule, they \
+            are skipped lazily when they reach the top of the heap. \
+                The heap has no lock, it is used by TaskQueue.
+        """
+        self.heap = list()
+        self.entry = dict()
+        self.counter = itertools.count()
+
+    def push(self, key: str | int, timestamp: float) -> None:
+        """Method adds or reschedules the key deadline."""
+        item = (timestamp, next(self.counter), key)
+        self.entry[key] = item
+        heapq.heappush(self.heap, item)
+
+    def push_many(self, items: list[tuple[str | int, float]]) -> None:
+        """
+        Method adds or reschedules many deadlines at once.
+        --------------------------------------------------
+        The heap is rebuilt once in O(n) instead of pushing every key.
+
+        :type items: list
+        :param items: [(key, timestamp), ...].
+        """
+        for key, timestamp in items:
+            item = (timestamp, next(self.counter), key)
+            self.entry[key] = item
+            self.heap.append(item)
+        heapq.heapify(self.heap)
+
+    def discard(self, key: str | int) -> None:
+        """Method removes the key deadline, if it exists."""
+        self.entry.pop(key, None)
+
+    def prune(self) -> None:
+        """Method drops outdated entries from the top of the heap."""
+        while self.heap and self.entry.get(
+            self.heap[0][2]
+        ) is not self.heap[0]:
+            heapq.heappop(self.heap)
+
+    def peek(self) -> float | None:
+        """Method returns the nearest deadline or None."""
+        self.prune()
+        if not self.heap:
+            return None
+        return self.heap[0][0]
+
+    def pop(self, worktime: float) -> str | int | None:
+        """Method returns the key whose deadline has come or None."""
+        self.prune()
+        if not self.heap or self.heap[0][0] > worktime:
+            return None
+        _, _, key = heapq.heappop(self.heap)
+        self.entry.pop(key, None)
+        return key
+
+    def size(self) -> int:
+        """Method returns the number of scheduled keys."""
+        return len(self.entry)
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 import os
+import copy
 import json
 from typing import Dict
 from typing import List
@@ -23,7 +24,16 @@ class BaseSchema(object):
                     "MINUTE": str()
                 },
                 "EXECUTE": {
-                    "SHELL": list()
+                    "SHELL": list(),
+                    "TIMEOUT": None,  # None - EXECUTOR.TIMEOUT
+                    "OVERLAP": str(),  # skip | queue | replace | parallel
+                    "PARALLEL": 0
+                },
+                "SCHEDULE": {
+                    "CATCHUP": str(),  # once | all | skip
+                    "TZ": str(),
+                    "JITTER": 0,
+                    "MODE": str()  # rate | delay
                 },
             },
         },
@@ -38,21 +48,62 @@ class BaseSchema(object):
                     "MINUTE": str()
                 },
                 "NAME": "shellLogEnvApp",
-                "TYPE": "gz",  # zip | gz
+                "TYPE": "gz",  # zip | gz | bz2 | xz
                 "DIR": "/opt/shellTaskEnv/log/arch",
-                "TRUNCATE": True
+                "TRUNCATE": True,
+                "LEVEL": 0,
+                "PARALLEL": 0,
+                "INCREMENTAL": bool(),
+                "STRATEGY": "rename",  # rename | truncate
+                "MAX_SIZE": 0,
+                "SIZE_CHECK": 5
             },
             "DELETE": {
                 "ENABLE": bool(),
-                "DAYS": 30
+                "DAYS": 30,
+                "MAX_COUNT": 0,
+                "MAX_SIZE": 0
             },
         },
         "CONFDUMP": {
             "ENABLE": bool(),
             "DIR": "/opt/shellTaskEnv/dump/copy_conf.json"
+        },
+        "EXECUTOR": {
+            "ENGINE": "thread",  # thread | asyncio
+            "WORKERS": 4,
+            "TIMEOUT": 0,
+            "KILL_DELAY": 5,
+            "OVERLAP": "queue",  # skip | queue | replace | parallel
+            "PARALLEL": 1
+        },
+        "SCHEDULER": {
+            "CATCHUP": "once",  # once | all | skip
+            "CATCHUP_LIMIT": 100,
+            "JUMP_THRESHOLD": 2,
+            "RELOAD": 5,
+            "TZ": str(),
+            "JITTER": 0,
+            "MAX_STARTS": 0,
+            "MODE": "rate"  # rate | delay
+        },
+        "SHARDING": {
+            "ENABLE": bool(),
+            "DIR": "/opt/shellTaskEnv/shard",
+            "NAME": str(),
+            "HEARTBEAT": 5,
+            "TTL": 15,
+            "REPLICAS": 64
         }
     }
 
+    # Sections that may be absent in conf.json, default values are used.
+    __OPTIONAL__ = (
+        "EXECUTOR",
+        "SCHEDULER",
+        "SHARDING",
+    )
+
 
 class BaseExportSchema(BaseSchema):
     """Сlass for creating a schema and setting attributes."""
@@ -80,6 +131,34 @@ class BaseExportSchema(BaseSchema):
         ]
     ] = None
     CONFDUMP: Dict[str, Union[bool, str]] = None
+    EXECUTOR: Dict[str, Union[str, int, float]] = None
+    SCHEDULER: Dict[str, Union[str, int, float]] = None
+    SHARDING: Dict[str, Union[bool, str, int, float]] = None
+
+    @classmethod
+    def fill_defaults(
+        cls,
+        data: dict,
+        schema: dict
+    ) -> dict:
+        """
+        Method for adding missing settings fields from the schema.
+        ----------------------------------------------------------
+        :type data: dict
+        :param data: section of the configuration file.
+
+        :type schema: dict
+        :param schema: section of the BaseSchema.__SCHEMA__.
+
+        :rtype: dict
+        :returns: section with default values of the missing fields.
+        """
+        for key, value in schema.items():
+            if key not in data:
+                data[key] = copy.deepcopy(value)
+            elif isinstance(value, dict) and isinstance(data[key], dict):
+                cls.fill_defaults(data[key], value)
+        return data
 
     @classmethod
     def add_file_json(
@@ -99,6 +178,30 @@ class BaseExportSchema(BaseSchema):
             with open(path, "w") as file:
                 json.dump(cls.__SCHEMA__, file, indent=4)
 
+    @classmethod
+    def read_file(
+        cls,
+        path: str
+    ) -> dict:
+        """
+        Method for reading a file with the default values of settings.
+        --------------------------------------------------------------
+        :type path: str
+        :param path: path to the configuration file.
+
+        :rtype: dict
+        :returns: json schema.
+        """
+        with open(path, "r") as schema:
+            data = json.load(schema)
+        for key in cls.__OPTIONAL__:
+            data.setdefault(key, dict())
+        for key, value in data.items():
+            if key != "TASK" and key in cls.__SCHEMA__:
+                if isinstance(value, dict):
+                    cls.fill_defaults(value, cls.__SCHEMA__[key])
+        return data
+
     @classmethod
     def load_from_file(
         cls,
@@ -110,10 +213,8 @@ class BaseExportSchema(BaseSchema):
         :type path: str
         :param path: path to the configuration file.
         """
-        with open(path, "r") as schema:
-            data = json.load(schema)
-            for key, value in data.items():
-                setattr(cls, key, value)
+        for key, value in cls.read_file(path).items():
+            setattr(cls, key, value)
 
     def __init__(
         self,
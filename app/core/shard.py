@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+import os
+import time
+import json
+import fcntl
+import socket
+import bisect
+import hashlib
+from typing import (
+    Dict,
+    List
+)
+
+
+class HashRing(object):
+    """Class for the consistent hashing of task keys between members."""
+
+    @staticmethod
+    def hash(value: str) -> int:
+        """
+        Method returns a stable hash of the string.
+        -------------------------------------------
+        The built-in hash() is salted for every process, so it \
+            cannot be used to agree between several instances.
+
+        :type value: str
+        :param value: task key or member point.
+
+        :rtype: int
+        :returns: 64-bit hash.
+        """
+        return int.from_bytes(
+            hashlib.blake2b(value.encode(), digest_size=8).digest(),
+            "big"
+        )
+
+    def __init__(
+        self,
+        members: List[str],
+        replicas: int = 64
+    ) -> None:
+        """
+        HashRing constructor object for the task distribution.
+        ------------------------------------------------------
+        :type members: list
+        :param members: names of the live members.
+
+        :type replicas: int
+        :param replicas: number of points of each member on the ring.
+        """
+        self.members = sorted(members)
+        points = sorted(
+            (self.hash(f"{name}#{x}"), name)
+            for name in self.members
+            for x in range(replicas)
+        )
+        self.points: List[int] = [x[0] for x in points]
+        self.names: List[str] = [x[1] for x in points]
+
+    def owner(self, key: str) -> str | None:
+        """
+        Method returns the member that owns the task key.
+        -------------------------------------------------
+        :type key: str
+        :param key: task key.
+
+        :rtype: str | None
+        :returns: member name or None, if the ring is empty.
+        """
+        if not self.points:
+            return None
+        index = bisect.bisect(self.points, self.hash(key))
+        return self.names[index % len(self.names)]
+
+
+class ShardMember(object):
+    """Class for the membership of the instance in the shard group."""
+
+    SUFFIX = ".member"
+
+    def __init__(
+        self,
+        dirpath: str,
+        name: str = "",
+        heartbeat: float = 5,
+        ttl: float = 15,
+        replicas: int = 64
+    ) -> None:
+        """
+        ShardMember constructor object for the shard coordination.
+        ----------------------------------------------------------
+        Each instance holds a lock on its member file while it is \
+            running and writes a heartbeat into it. A member is \
+                considered dead, if its lock is free or its heartbeat \
+                    is older than ttl.
+
+        :type dirpath: str
+        :param dirpath: shared directory of the member files.
+
+        :type name: str
+        :param name: member name, "" - hostname and pid.
+
+        :type heartbeat: float
+        :param heartbeat: heartbeat interval (sec).
+
+        :type ttl: float
+        :param ttl: time (sec) after which a silent member is dead.
+
+        :type replicas: int
+        :param replicas: number of points of each member on the ring.
+        """
+        if ttl <= heartbeat:
+            raise ValueError(
+                "Error. SHARDING.TTL must be greater than "
+                "SHARDING.HEARTBEAT."
+            )
+        self.dirpath = dirpath
+        self.name = name or f"{socket.gethostname()}-{os.getpid()}"
+        self.heartbeat = heartbeat
+        self.ttl = ttl
+        self.replicas = replicas
+        self.pathfile = os.path.join(dirpath, self.name + self.SUFFIX)
+        self.ring = HashRing([self.name], replicas)
+        self.deadline: float = None
+        self.fd: int = None
+
+    def join(self) -> None:
+        """Method creates and locks the member file of the instance."""
+        if not os.path.isdir(self.dirpath):
+            os.makedirs(self.dirpath, exist_ok=True)
+        self.fd = os.open(self.pathfile, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.lockf(self.fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(self.fd)
+            self.fd = None
+            raise ValueError(
+                f"Error. The shard member '{self.name}' is already "
+                "running."
+            )
+        self.beat()
+
+    def beat(self) -> None:
+        """
+        Method writes the heartbeat into the member file.
+        -------------------------------------------------
+        The file is rewritten through the locked descriptor, \
+            reopening it would release the lock. If the file was \
+                removed by another instance, it is created again.
+        """
+        if os.fstat(self.fd).st_nlink == 0:
+            os.close(self.fd)
+            self.join()
+            return
+        record = json.dumps({
+            "name": self.name,
+            "host": socket.gethostname(),
+            "pid": os.getpid(),
+            "heartbeat": time.time()
+        }).encode()
+        os.lseek(self.fd, 0, os.SEEK_SET)
+        os.ftruncate(self.fd, 0)
+        os.write(self.fd, record)
+        os.fsync(self.fd)
+
+    def alive(self, pathfile: str, now: float) -> bool:
+        """
+        Method checks the member file of another instance.
+        --------------------------------------------------
+        The file of a dead member is removed. A free lock is trusted \
+            only for the members of the same host, the members of \
+                other hosts are checked by the heartbeat.
+
+        :type pathfile: str
+        :param pathfile: path to the member file.
+
+        :type now: float
+        :param now: current timestamp.
+
+        :rtype: bool
+        :returns: True, if the member is alive.
+        """
+        try:
+            fd = os.open(pathfile, os.O_RDWR)
+        except FileNotFoundError:
+            return False
+        try:
+            try:
+                record = json.loads(os.pread(fd, 4096, 0))
+                fresh = now - record["heartbeat"] <= self.ttl
+                local = record["host"] == socket.gethostname()
+            except (ValueError, KeyError, TypeError):
+                # The heartbeat is being written, the lock decides.
+                fresh, local = True, True
+            try:
+                fcntl.lockf(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                return fresh
+            if local or not fresh:
+                os.unlink(pathfile)
+                return False
+            return True
+        finally:
+            os.close(fd)
+
+    def members(self) -> List[str]:
+        """
+        Method returns the names of the live members.
+        ---------------------------------------------
+        :rtype: list
+        :returns: sorted member names, including the instance.
+        """
+        now = time.time()
+        names = [self.name]
+        with os.scandir(self.dirpath) as entries:
+            for entry in entries:
+                if not entry.name.endswith(self.SUFFIX):
+                    continue
+                name = entry.name[:-len(self.SUFFIX)]
+                if name != self.name and self.alive(entry.path, now):
+                    names.append(name)
+        return sorted(names)
+
+    def update(self, worktime: float) -> bool:
+        """
+        Method writes the heartbeat and rebuilds the ring on time.
+        ----------------------------------------------------------
+        :type worktime: float
+        :param worktime: current monotonic timestamp.
+
+        :rtype: bool
+        :returns: True, if the live members were changed.
+        """
+        if self.deadline is not None and worktime < self.deadline:
+            return False
+        self.deadline = worktime + self.heartbeat
+        self.beat()
+        members = self.members()
+        if members == self.ring.members:
+            return False
+        self.ring = HashRing(members, self.replicas)
+        return True
+
+    def owns(self, key: str) -> bool:
+        """
+        Method returns True, if the task key belongs to the instance.
+        -------------------------------------------------------------
+        :type key: str
+        :param key: task key.
+        """
+        return self.ring.owner(key) == self.name
+
+    def owned(self, keys: List[str]) -> Dict[str, List[str]]:
+        """
+        Method returns the distribution of the task keys.
+        -------------------------------------------------
+        :type keys: list
+        :param keys: task keys.
+
+        :rtype: dict
+        :returns: {member name: [task keys]}.
+        """
+        out: Dict[str, List[str]] = {x: [] for x in self.ring.members}
+        for key in keys:
+            out[self.ring.owner(key)].append(key)
+        return out
+
+    def leave(self) -> None:
+        """Method removes the member file of the instance."""
+        if self.fd is None:
+            return
+        try:
+            os.unlink(self.pathfile)
+        except FileNotFoundError:
+            pass
+        os.close(self.fd)
+        self.fd = None
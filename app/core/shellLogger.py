@@ -4,6 +4,25 @@ import time
 import logging
 
 
+class ReopenFileHandler(logging.FileHandler):
+    """Class of the file handler that can reopen its log file."""
+
+    def reopen(self) -> None:
+        """
+        Method opens the log file again after it was renamed.
+        -----------------------------------------------------
+        The new stream of baseFilename replaces the old one under \
+            the handler lock, so no record is written in between.
+        """
+        self.acquire()
+        try:
+            stream, self.stream = self.stream, self._open()
+            if stream is not None:
+                stream.close()
+        finally:
+            self.release()
+
+
 class Logger:
     """Class for configuring the logger."""
 
@@ -32,11 +51,38 @@ class Logger:
         logging.Formatter.converter = time.localtime
         logger = logging.getLogger(getlogger)
         logger.setLevel(level=level)
-        loggerFile = logging.FileHandler(pathfile)
+        loggerFile = ReopenFileHandler(pathfile)
         loggerFile.setFormatter(formatter)
         logger.addHandler(loggerFile)
         return logger
 
+    @classmethod
+    def reopen(
+        cls,
+        pathfile: str
+    ) -> int:
+        """
+        Method reopens the file handlers of pathfile in all loggers.
+        ------------------------------------------------------------
+        It is called after the log file is renamed, the records are \
+            written to the new file without the process restart.
+
+        @returns: number of the reopened handlers.
+        """
+        pathfile = os.path.abspath(pathfile)
+        loggers = [logging.getLogger()] + [
+            logger for logger in logging.Logger.manager.loggerDict.values()
+            if isinstance(logger, logging.Logger)
+        ]
+        handlers = {
+            handler for logger in loggers for handler in logger.handlers
+            if isinstance(handler, ReopenFileHandler)
+            and handler.baseFilename == pathfile
+        }
+        for handler in handlers:
+            handler.reopen()
+        return len(handlers)
+
     def __init__(
         self,
         pathfile: str,
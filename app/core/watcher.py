@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+import os
+import time
+
+
+class ConfWatcher(object):
+    """Class for detecting changes of the configuration file."""
+
+    @staticmethod
+    def signature(path: str) -> tuple | None:
+        """
+        Method returns the file state without reading it.
+        -------------------------------------------------
+        :type path: str
+        :param path: path to the configuration file.
+
+        :rtype: tuple | None
+        :returns: (device, inode, size, mtime) or None, if not found.
+        """
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (
+            stat.st_dev,
+            stat.st_ino,
+            stat.st_size,
+            stat.st_mtime_ns
+        )
+
+    def __init__(
+        self,
+        path: str,
+        interval: float = 5
+    ) -> None:
+        """
+        ConfWatcher constructor object for polling the file state.
+        ----------------------------------------------------------
+        :type path: str
+        :param path: path to the configuration file.
+
+        :type interval: float
+        :param interval: polling interval (sec), 0 - disabled.
+        """
+        self.path = path
+        self.interval = interval
+        self.last = self.signature(path)
+        self.deadline = None
+        if interval:
+            self.deadline = time.monotonic() + interval
+
+    def changed(self, worktime: float) -> bool:
+        """
+        Method checks the file, if the polling time has come.
+        -----------------------------------------------------
+        :type worktime: float
+        :param worktime: current monotonic timestamp.
+
+        :rtype: bool
+        :returns: True, if the file was replaced or modified.
+        """
+        if self.deadline is None or worktime < self.deadline:
+            return False
+        self.deadline = worktime + self.interval
+        current = self.signature(self.path)
+        if current is None or current == self.last:
+            return False
+        self.last = current
+        return True
+
+
+class SizeWatcher(object):
+    """Class for detecting the growth of the log file over the limit."""
+
+    def __init__(
+        self,
+        path: str,
+        limit: float = 0,
+        interval: float = 5
+    ) -> None:
+        """
+        SizeWatcher constructor object for polling the file size.
+        ---------------------------------------------------------
+        Only os.stat() of the file is called, the directory is not \
+            scanned.
+
+        :type path: str
+        :param path: path to the log file.
+
+        :type limit: float
+        :param limit: growth of the file (bytes), 0 - disabled.
+
+        :type interval: float
+        :param interval: polling interval (sec).
+        """
+        self.path = path
+        self.limit = limit
+        self.interval = interval
+        self.size = 0
+        # Size of the file at the last exceeding.
+        self.base = 0
+        self.deadline = None
+        if limit:
+            self.deadline = time.monotonic() + interval
+
+    def exceeded(self, worktime: float) -> bool:
+        """
+        Method checks the file size, if the polling time has come.
+        ----------------------------------------------------------
+        :type worktime: float
+        :param worktime: current monotonic timestamp.
+
+        :rtype: bool
+        :returns: True, if the file has grown by the limit since \
+            the last exceeding or since it was truncated.
+        """
+        if self.deadline is None or worktime < self.deadline:
+            return False
+        self.deadline = worktime + self.interval
+        try:
+            self.size = os.stat(self.path).st_size
+        except FileNotFoundError:
+            return False
+        if self.size < self.base:
+            self.base = 0
+        if self.size - self.base < self.limit:
+            return False
+        self.base = self.size
+        return True
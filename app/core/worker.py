@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+import time
+import multiprocessing
+from concurrent.futures import (
+    Future,
+    ProcessPoolExecutor
+)
+from concurrent.futures.process import BrokenProcessPool
+from core.handlers import RotateLogFiles
+
+
+class RotationWorker(object):
+    """Class for running the log rotation in a separate process."""
+
+    def __init__(self) -> None:
+        """
+        RotationWorker constructor object for the background rotation.
+        --------------------------------------------------------------
+        The worker process is started on the first rotation. Only one \
+            rotation is executed at a time.
+        """
+        self.pool: ProcessPoolExecutor = None
+        self.future: Future = None
+        self.startTime: float = None
+
+    def running(self) -> bool:
+        """Method returns True, if the rotation is in progress."""
+        return self.future is not None and not self.future.done()
+
+    def ready(self) -> bool:
+        """Method returns True, if a new rotation can be started."""
+        return self.future is None
+
+    def start(self, data: dict, renamed: str = None) -> bool:
+        """
+        Method for starting the rotation in the worker process.
+        -------------------------------------------------------
+        :type data: dict
+        :param data: object BaseExportSchema.LOGROTATION.
+
+        :type renamed: str
+        :param renamed: the renamed logfile, see RotateLogFiles.
+
+        :rtype: bool
+        :returns: False, if the previous rotation is in progress.
+        """
+        if self.future is not None:
+            return False
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        self.startTime = time.monotonic()
+        self.future = self.pool.submit(RotateLogFiles, data, renamed)
+        return True
+
+    def poll(self) -> RotateLogFiles | BaseException | None:
+        """
+        Method for receiving the status of the finished rotation.
+        ---------------------------------------------------------
+        :rtype: object
+        :returns: RotateLogFiles, exception of the rotation or None, \
+            if the rotation is not finished.
+        """
+        if self.future is None or not self.future.done():
+            return None
+        future, self.future = self.future, None
+        err = future.exception()
+        if isinstance(err, BrokenProcessPool):
+            self.pool = None
+        if err is not None:
+            return err
+        return future.result()
+
+    def shutdown(self) -> None:
+        """Method stops the worker process."""
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
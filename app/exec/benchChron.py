@@ -0,0 +1,579 @@
+# -*- coding: utf-8 -*-
+import time
+import random
+from datetime import (
+    datetime,
+    timedelta
+)
+from typing import (
+    Callable,
+    Dict,
+    List,
+    Tuple
+)
+from core.chron import (
+    AddIntervalTask,
+    AddPlanTask,
+    CheckDays,
+    ChronClock,
+    CronSchedule,
+    IntervalSchedule,
+    PlanSchedule,
+    ScheduleBatch
+)
+from exec import runTask
+
+
+# Cron expressions with the month ends, leap days and weekdays.
+CRON = (
+    "0 0 29 2 *",
+    "30 23 31 * *",
+    "59 23 28-31 * *",
+    "0 12 * * 1-5",
+    "*/15 * 1,15 * mon",
+    "0 0 1 */3 *",
+    "45 6 30 jan,apr,dec *",
+    "@monthly",
+    "@yearly",
+    "0 0 13 * fri"
+)
+# Reference values of the names and macros of CRON.
+CRON_NAMES = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+    "sun": 0, "mon": 1, "tue": 2, "wed": 3, "thu": 4, "fri": 5, "sat": 6
+}
+CRON_MACROS = {
+    "@monthly": "0 0 1 * *",
+    "@yearly": "0 0 1 1 *"
+}
+# Dates near the month and year ends, leap and non-leap years.
+EDGES = (
+    datetime(2023, 1, 31, 23, 59, 30),
+    datetime(2023, 2, 28, 12, 0, 15),
+    datetime(2023, 4, 30, 23, 30, 45),
+    datetime(2023, 12, 31, 23, 59, 59),
+    datetime(2024, 1, 30, 8, 15, 1),
+    datetime(2024, 2, 28, 23, 59, 30),
+    datetime(2024, 2, 29, 0, 0, 30),
+    datetime(2024, 8, 31, 22, 10, 5),
+    datetime(2025, 3, 31, 10, 0, 1),
+    datetime(2100, 2, 28, 23, 0, 20)
+)
+# Search limit of the reference (days), more than the 8-year leap gap.
+HORIZON = 366 * 9
+
+
+def makeStarts(count: int, rnd: random.Random) -> List[datetime]:
+    """
+    Function returns the fake "now" dates and times of the check.
+    -------------------------------------------------------------
+    The seconds are never 0: at the exact minute PlanTask returns \
+        the same minute, while the reference returns the next one.
+
+    :type count: int
+    :param count: number of random dates in addition to EDGES.
+
+    :type rnd: random.Random
+    :param rnd: seeded generator.
+
+    :rtype: list
+    :returns: [datetime, ...].
+    """
+    starts = list(EDGES)
+    for _ in range(count):
+        year, month = rnd.randint(2023, 2028), rnd.randint(1, 12)
+        lastDay = CheckDays.calc_day_in_month(year, month)
+        day = rnd.randint(1, lastDay)
+        if rnd.random() < 0.7:
+            day = rnd.randint(lastDay - 3, lastDay)
+        starts.append(datetime(
+            year,
+            month,
+            day,
+            rnd.randint(0, 23),
+            rnd.randint(0, 59),
+            rnd.randint(1, 59)
+        ))
+    return starts
+
+
+def makeFields(rnd: random.Random) -> Tuple[int | None, ...]:
+    """
+    Function returns random PlanTask fields (month, day, hour, minute).
+    -------------------------------------------------------------------
+    The fields below the first set field are always set, otherwise \
+        PlanTask takes them from "now" and there is no calendar rule \
+            to check.
+
+    :type rnd: random.Random
+    :param rnd: seeded generator.
+
+    :rtype: tuple
+    :returns: (month, day, hour, minute), None - not set.
+    """
+    top = rnd.randint(0, 3)
+    fields = [
+        rnd.randint(1, 12),
+        rnd.choice((1, 28, 29, 30, 31)) if rnd.random() < 0.6
+        else rnd.randint(1, 31),
+        rnd.randint(0, 23),
+        rnd.randint(0, 59)
+    ]
+    return tuple(None if x < top else fields[x] for x in range(4))
+
+
+def makeTasks(count: int, rnd: random.Random) -> List[dict]:
+    """
+    Function returns synthetic DATE_TIME objects of the tasks.
+    ----------------------------------------------------------
+    :type count: int
+    :param count: number of tasks.
+
+    :type rnd: random.Random
+    :param rnd: seeded generator.
+
+    :rtype: list
+    :returns: [BaseExportSchema.TASK[key]["DATE_TIME"], ...], \
+        PlanTask, IntervalTask and CronTask in equal parts.
+    """
+    tasks = list()
+    for x in range(count):
+        if x % 3 == 0:
+            fields = makeFields(rnd)
+            tasks.append(dict(zip(
+                ("MONTH", "DAYS", "HOURS", "MINUTE"),
+                ("*" if y is None else str(y) for y in fields)
+            )))
+        elif x % 3 == 1:
+            step = rnd.choice(("MINUTE", "HOURS", "DAYS"))
+            value = str(rnd.randint(1, 30))
+            if step == "MINUTE" and rnd.random() < 0.5:
+                value += ".0"
+            dateTime = dict.fromkeys(("MONTH", "DAYS", "HOURS", "MINUTE"), "*")
+            dateTime[step] = "*/" + value
+            tasks.append(dateTime)
+        else:
+            tasks.append({
+                "MONTH": "",
+                "DAYS": "",
+                "HOURS": "",
+                "MINUTE": "",
+                "CRON": rnd.choice(CRON)
+            })
+    return tasks
+
+
+def referenceDTime(
+    matchDay: Callable[[datetime], bool],
+    matchTime: Callable[[int, int], bool],
+    now: datetime
+) -> datetime | None:
+    """
+    Function for the brute-force search of the next date and time.
+    ---------------------------------------------------------------
+    The minutes of the matching days are checked one by one, the \
+        days that do not match are skipped whole.
+
+    :type matchDay: Callable
+    :param matchDay: returns True for the allowed date.
+
+    :type matchTime: Callable
+    :param matchTime: returns True for the allowed (hour, minute).
+
+    :type now: datetime
+    :param now: current date and time.
+
+    :rtype: datetime | None
+    :returns: first minute after now or None, if not found in HORIZON.
+    """
+    day = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    for _ in range(HORIZON):
+        if matchDay(day):
+            for minute in range(24 * 60):
+                dTime = day + timedelta(minutes=minute)
+                if dTime > now and matchTime(*divmod(minute, 60)):
+                    return dTime
+        day += timedelta(days=1)
+    return None
+
+
+def planReference(
+    fields: Tuple[int | None, ...],
+    now: datetime
+) -> datetime | None:
+    """
+    Function returns the reference time of the PlanTask fields.
+    -----------------------------------------------------------
+    :type fields: tuple
+    :param fields: (month, day, hour, minute), None - any value.
+
+    :type now: datetime
+    :param now: current date and time.
+
+    :rtype: datetime | None
+    :returns: first minute after now with all set fields.
+    """
+    mo, d, h, m = fields
+    return referenceDTime(
+        lambda x: (mo is None or x.month == mo) and (d is None or x.day == d),
+        lambda hour, minute: (h is None or hour == h) and minute == m,
+        now
+    )
+
+
+def matchCronField(
+    expr: str,
+    value: int,
+    low: int,
+    high: int
+) -> bool:
+    """
+    Function checks the value by the text of the cron field.
+    --------------------------------------------------------
+    The field is read again for every value, without the parser \
+        and the bitmasks of CronSchedule.
+
+    :type expr: str
+    :param expr: cron field, for example "1-30/5,jan".
+
+    :type value: int
+    :param value: checked value.
+
+    :type low: int
+    :param low: minimum value of the field.
+
+    :type high: int
+    :param high: maximum value of the field.
+
+    :rtype: bool
+    :returns: True, if the value is allowed.
+    """
+    for item in expr.lower().split(","):
+        rng, slash, step = item.partition("/")
+        if rng == "*":
+            first, last = low, high
+        elif "-" in rng:
+            first, last = (
+                CRON_NAMES[x] if x in CRON_NAMES else int(x)
+                for x in rng.split("-")
+            )
+        else:
+            first = CRON_NAMES[rng] if rng in CRON_NAMES else int(rng)
+            last = high if slash else first
+        if first <= value <= last and (value - first) % int(step or 1) == 0:
+            return True
+    return False
+
+
+def cronReference(
+    expr: str,
+    now: datetime
+) -> datetime | None:
+    """
+    Function returns the reference time of the cron expression.
+    -----------------------------------------------------------
+    The reference is built from the raw expression, so the check \
+        covers the parser and the search of next_from().
+
+    :type expr: str
+    :param expr: cron expression or macro.
+
+    :type now: datetime
+    :param now: current date and time.
+
+    :rtype: datetime | None
+    :returns: first matching minute after now.
+    """
+    minute, hour, day, month, weekday = CRON_MACROS.get(expr, expr).split()
+
+    def matchDay(x: datetime) -> bool:
+        dow = (x.weekday() + 1) % 7
+        dayOk = matchCronField(day, x.day, 1, 31)
+        weekOk = matchCronField(weekday, dow, 0, 7) or (
+            dow == 0 and matchCronField(weekday, 7, 0, 7)
+        )
+        if day.startswith("*") or weekday.startswith("*"):
+            dayOk = dayOk and weekOk
+        else:
+            dayOk = dayOk or weekOk
+        return dayOk and matchCronField(month, x.month, 1, 12)
+
+    return referenceDTime(
+        matchDay,
+        lambda h, m: (
+            matchCronField(hour, h, 0, 23) and
+            matchCronField(minute, m, 0, 59)
+        ),
+        now
+    )
+
+
+def compareDTime(
+    stats: Dict[str, dict],
+    name: str,
+    case: str,
+    calc: Callable[[], datetime],
+    expected: datetime | None,
+    legacy: Callable[[datetime], bool] = None
+) -> None:
+    """
+    Function compares the calculated time with the expected one.
+    ------------------------------------------------------------
+    :type stats: dict
+    :param stats: {name: {"ok": int, "diff": int, "error": int, \
+        "legacy": int, "examples": list}}, updated in place.
+
+    :type name: str
+    :param name: name of the checked calculation.
+
+    :type case: str
+    :param case: description of the schedule and "now".
+
+    :type calc: Callable
+    :param calc: calculation of the checked time.
+
+    :type expected: datetime | None
+    :param expected: reference time.
+
+    :type legacy: Callable
+    :param legacy: returns True, if the different result is the known \
+        legacy behaviour, it is counted apart from the diffs.
+    """
+    stat = stats.setdefault(
+        name,
+        {"ok": 0, "diff": 0, "error": 0, "legacy": 0, "examples": list()}
+    )
+    try:
+        result = calc()
+    except (ValueError, OverflowError) as err:
+        stat["error"] += 1
+        stat["examples"].append(f"{case}: {err}")
+        return
+    if result == expected:
+        stat["ok"] += 1
+        return
+    if legacy is not None and legacy(result):
+        stat["legacy"] += 1
+        stat["examples"].append(
+            f"legacy {case}: {result}, expected {expected}"
+        )
+        return
+    stat["diff"] += 1
+    stat["examples"].append(f"{case}: {result}, expected {expected}")
+
+
+def planLegacy(
+    fields: Tuple[int | None, ...]
+) -> Callable[[datetime], bool]:
+    """
+    Function returns the check of the legacy PlanTask month overflow.
+    -----------------------------------------------------------------
+    The day that the month does not have (for example, April 31) \
+        is moved to the next month by AddPlanTask, PlanSchedule keeps \
+            it: the result is the day counted from the first day of \
+                the month, with the set hour and minute.
+
+    :type fields: tuple
+    :param fields: (month, day, hour, minute), None - any value.
+
+    :rtype: Callable
+    :returns: True only for the result of the month overflow.
+    """
+    mo, d, h, m = fields
+
+    def overflow(result: datetime | None) -> bool:
+        if d is None or result is None or result.day == d:
+            return False
+        last = result.replace(day=1) - timedelta(days=1)
+        return (
+            d > last.day and
+            (mo is None or last.month == mo) and
+            result.date() == (
+                last.replace(day=1) + timedelta(days=d - 1)
+            ).date() and
+            (h is None or result.hour == h) and
+            result.minute == m
+        )
+
+    return overflow
+
+
+def checkChron(
+    cases: int = 200,
+    seed: int = 0
+) -> Dict[str, dict]:
+    """
+    Function checks the chron calculations under the fake clock.
+    ------------------------------------------------------------
+    PlanTask and CronTask are compared with the brute-force \
+        reference, the compiled schedules with the legacy classes, \
+            IntervalTask has no calendar rules to check. The month \
+                overflow of PlanTask is counted as "legacy".
+
+    :type cases: int
+    :param cases: number of random schedules and random "now".
+
+    :type seed: int
+    :param seed: seed of the generator, the same seed - the same cases.
+
+    :rtype: dict
+    :returns: {name: {"ok": int, "diff": int, "error": int, \
+        "legacy": int, "examples": list}}.
+    """
+    rnd = random.Random(seed)
+    stats: Dict[str, dict] = dict()
+    starts = makeStarts(cases, rnd)
+    try:
+        for now in starts:
+            ChronClock.reference = now
+            fields = makeFields(rnd)
+            case = f"PlanTask{fields} at {now}"
+            expected = planReference(fields, now)
+            compareDTime(
+                stats, "AddPlanTask", case,
+                lambda: AddPlanTask(*fields).current_datetime(),
+                expected,
+                planLegacy(fields)
+            )
+            compareDTime(
+                stats, "PlanSchedule", case,
+                lambda: PlanSchedule(*fields).next_from(now),
+                expected,
+                planLegacy(fields)
+            )
+            try:
+                legacy = AddPlanTask(*fields).current_datetime()
+            except ValueError:
+                legacy = None
+            if legacy is not None:
+                compareDTime(
+                    stats, "PlanSchedule = AddPlanTask", case,
+                    lambda: PlanSchedule(*fields).next_from(now),
+                    legacy
+                )
+
+            expr = rnd.choice(CRON)
+            compareDTime(
+                stats, "CronSchedule",
+                f"CRON='{expr}' at {now}",
+                lambda: CronSchedule(expr).next_from(now),
+                cronReference(expr, now)
+            )
+
+            fields = [None] * 4
+            fields[rnd.randint(0, 3)] = rnd.choice(
+                (rnd.randint(0, 40), rnd.randint(1, 90) / 2)
+            )
+            compareDTime(
+                stats, "IntervalSchedule",
+                f"IntervalTask{tuple(fields)} at {now}",
+                lambda: IntervalSchedule(*fields).next_from(now),
+                AddIntervalTask(*fields).current_datetime()
+            )
+    finally:
+        ChronClock.reference = None
+    return stats
+
+
+def timeCalc(
+    calc: Callable[[], object],
+    repeat: int
+) -> float:
+    """
+    Function returns the best time of the calculation.
+    --------------------------------------------------
+    :type calc: Callable
+    :param calc: measured calculation.
+
+    :type repeat: int
+    :param repeat: number of measurements.
+
+    :rtype: float
+    :returns: seconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        calc()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchChron(
+    size: int = 10000,
+    repeat: int = 3,
+    seed: int = 0,
+    start: datetime = None
+) -> List[Tuple[str, int, float]]:
+    """
+    Function measures the next time calculations of the synthetic tasks.
+    --------------------------------------------------------------------
+    The legacy AddPlanTask and AddIntervalTask read the fake clock \
+        ChronClock.reference, the compiled schedules get the same \
+            "now" as the argument.
+
+    :type size: int
+    :param size: number of synthetic tasks.
+
+    :type repeat: int
+    :param repeat: number of measurements, the best one is returned.
+
+    :type seed: int
+    :param seed: seed of the generator.
+
+    :type start: datetime
+    :param start: fake "now", None - EDGES[0].
+
+    :rtype: list
+    :returns: [(name, number of calculations, seconds), ...].
+    """
+    rnd = random.Random(seed)
+    now = start or EDGES[0]
+    tasks = makeTasks(size, rnd)
+    plans = [
+        runTask.__formattingTypes(x) for x in tasks[::3]
+    ]
+    intervals = [
+        runTask.__formattingTypes(x) for x in tasks[1::3]
+    ]
+
+    def compileTasks() -> list:
+        runTask.SCHEDULES.clear()
+        return [runTask.__compileDTime(x) for x in tasks]
+
+    def calcTasks() -> list:
+        return [
+            runTask.__calcDTime(x, reference=now) for x in tasks
+        ]
+
+    schedules = compileTasks()
+    out = list()
+    try:
+        ChronClock.reference = now
+        out.append(("AddPlanTask", len(plans), timeCalc(
+            lambda: [AddPlanTask(*x).current_datetime() for x in plans],
+            repeat
+        )))
+        out.append(("AddIntervalTask", len(intervals), timeCalc(
+            lambda: [
+                AddIntervalTask(*x).current_datetime() for x in intervals
+            ],
+            repeat
+        )))
+        out.append(("__compileDTime", size, timeCalc(compileTasks, repeat)))
+        out.append(("__calcDTime", size, timeCalc(calcTasks, repeat)))
+        for kind in (PlanSchedule, IntervalSchedule, CronSchedule):
+            items = [x for x in schedules if type(x) is kind]
+            out.append((f"{kind.__name__}.next_from", len(items), timeCalc(
+                lambda: [x.next_from(now) for x in items],
+                repeat
+            )))
+        out.append(("ScheduleBatch.next_after", size, timeCalc(
+            lambda: ScheduleBatch.next_after(schedules, now.timestamp()),
+            repeat
+        )))
+    finally:
+        ChronClock.reference = None
+        runTask.SCHEDULES.clear()
+    return out
@@ -1,25 +1,69 @@
 # -*- coding: utf-8 -*-
-import os
 import re
+import heapq
+import hashlib
 import time
 import signal
-from typing import Generator
-from core.queue import DictQueue
+from collections import deque
+from datetime import datetime
+from typing import (
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    Tuple
+)
+from core.clock import MonotonicClock
+from core.executor import (
+    StartLimiter,
+    checkExecute,
+    getExecutor
+)
+from core.watcher import (
+    ConfWatcher,
+    SizeWatcher
+)
+from core.shard import ShardMember
+from core.queue import (
+    TaskQueue,
+    TaskRecord,
+    TaskType
+)
 from core.shellLogger import Logger
 from core.schema import BaseExportSchema
 from core.chron import (
-    AddPlanTask,
-    AddIntervalTask
+    ChronClock,
+    CronSchedule,
+    IntervalSchedule,
+    PlanSchedule,
+    ScheduleBatch,
+    ZoneTable,
+    LocalZone
 )
 from core.handlers import (
     CopyConfDump,
-    DeleteLogArch,
-    LogArch,
-    TruncateLogFile
+    RenameLogFile,
+    RotateLogFiles
 )
+from core.worker import RotationWorker
 
 
-QUEUE = DictQueue()
+QUEUE = TaskQueue()
+CLOCK = MonotonicClock()
+ROTATION = RotationWorker()
+# Number of runs missed by the tasks during the wall-clock jump.
+MISSED: Dict[str, int] = dict()
+CATCHUP = ("once", "all", "skip")
+# IntervalTask: "rate" - on the grid of the first time, "delay" - from now.
+MODES = ("rate", "delay")
+# LOGROTATION: "rename" - rename and reopen, "truncate" - copy and truncate.
+STRATEGIES = ("rename", "truncate")
+# Due tasks waiting for SCHEDULER.MAX_STARTS: (key, scheduled timestamp).
+DEFERRED: deque = deque()
+# Compiled DATE_TIME of the tasks, the key is DATE_TIME items.
+SCHEDULES: Dict[
+    tuple, CronSchedule | IntervalSchedule | PlanSchedule | None
+] = dict()
 
 
 def getLogger(
@@ -114,8 +158,8 @@ def __formattingTypes(
     isInt: bool = lambda string: string.isdigit()
     values = [
         (
-            re.sub(r"[/*, !@#$%?]", "", x)
-        ) for x in data.values()
+            re.sub(r"[/*, !@#$%?]", "", data[x])
+        ) for x in ("MONTH", "DAYS", "HOURS", "MINUTE")
     ]
     mo, d, h, mi = [
         x if x.strip() else None for x in values
@@ -149,8 +193,222 @@ def __formattingTypes(
     return mo, d, h, mi
 
 
-def __calcDTime(
+def __compileDTime(
     data: dict = BaseExportSchema.TASK
+) -> CronSchedule | IntervalSchedule | PlanSchedule | None:
+    """
+    Function for compiling the task date and time once.
+    ---------------------------------------------------
+    The "CRON" key takes precedence over the MONTH, DAYS, HOURS \
+        and MINUTE fields.
+
+    :type data: dict
+    :param data: object BaseExportSchema.TASK
+
+    :rtype: object
+    :returns: CronSchedule, IntervalSchedule, PlanSchedule or None, \
+        if the date and time are not set.
+    """
+    key = tuple(data.items()) if isinstance(data, dict) else None
+    if key in SCHEDULES:
+        return SCHEDULES[key]
+    if key is not None and data.get("CRON"):
+        SCHEDULES[key] = CronSchedule(data["CRON"])
+        return SCHEDULES[key]
+    dTime = __formattingTypes(data)
+    fields = "".join(
+        data[x] for x in ("MONTH", "DAYS", "HOURS", "MINUTE")
+    )
+    schedule = None
+    if (
+        "/" in fields or
+        any(isinstance(x, float) for x in dTime)
+    ):
+        schedule = IntervalSchedule(*dTime)
+    elif (
+        "*" in fields or
+        any(isinstance(x, int) for x in dTime)
+    ):
+        schedule = PlanSchedule(*dTime)
+    SCHEDULES[key] = schedule
+    return schedule
+
+
+def __checkShellTask(
+    key: str,
+    data: dict
+) -> CronSchedule | IntervalSchedule | PlanSchedule | None:
+    """
+    Function for checking the task settings before adding it.
+    ---------------------------------------------------------
+    :type key: str
+    :param key: task key.
+
+    :type data: dict
+    :param data: object BaseExportSchema.TASK[key].
+
+    :rtype: object
+    :returns: compiled DATE_TIME of the task, see __compileDTime().
+    """
+    if not isinstance(data["EXECUTE"]["SHELL"], list):
+        raise TypeError(
+            f"Error. The SHELL of the task '{key}' must be a list."
+        )
+    checkExecute(data["EXECUTE"])
+    __catchUpPolicy(data)
+    __taskZone(data)
+    __jitterShellTask(key, data)
+    schedule = __compileDTime(data["DATE_TIME"])
+    if isinstance(schedule, IntervalSchedule):
+        __taskMode(data)
+    return schedule
+
+
+def __taskZone(
+    data: dict = None
+) -> ZoneTable | LocalZone:
+    """
+    Function returns the time zone of the task.
+    -------------------------------------------
+    :type data: dict
+    :param data: object BaseExportSchema.TASK[key], \
+        None - SCHEDULER.TZ, for example, for LOGROTATION.
+
+    :rtype: object
+    :returns: ZoneTable or LocalZone, if TZ is not set.
+    """
+    tz = None
+    if data is not None:
+        tz = data.get("SCHEDULE", dict()).get("TZ")
+    if not tz:
+        tz = (BaseExportSchema.SCHEDULER or dict()).get("TZ")
+    return ZoneTable.get(tz or "")
+
+
+def __jitterShellTask(
+    key: str,
+    data: dict = None
+) -> float:
+    """
+    Function returns the start offset of the task.
+    ----------------------------------------------
+    The offset is calculated from the hash of the task key, so it \
+        is the same for every run and every instance.
+
+    :type key: str
+    :param key: task key.
+
+    :type data: dict
+    :param data: object BaseExportSchema.TASK[key].
+
+    :rtype: float
+    :returns: offset (sec) in [0, JITTER), 0 - JITTER is less than \
+        a millisecond.
+    """
+    window = 0
+    if data is not None:
+        window = data.get("SCHEDULE", dict()).get("JITTER")
+    if not window:
+        window = (BaseExportSchema.SCHEDULER or dict()).get("JITTER")
+    if window is not None and (
+        isinstance(window, bool) or
+        not isinstance(window, (int, float)) or
+        window < 0
+    ):
+        raise KeyError(
+            f"JITTER='{window}'"
+        )
+    span = int((window or 0) * 1000)
+    if not span:
+        return 0.0
+    digest = hashlib.blake2b(str(key).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % span / 1000
+
+
+def __taskMode(
+    data: dict = None
+) -> str:
+    """
+    Function returns the IntervalTask mode of the task.
+    ---------------------------------------------------
+    :type data: dict
+    :param data: object BaseExportSchema.TASK[key].
+
+    :rtype: str
+    :returns: "rate" or "delay".
+    """
+    mode = None
+    if data is not None:
+        mode = data.get("SCHEDULE", dict()).get("MODE")
+    if not mode:
+        mode = (BaseExportSchema.SCHEDULER or dict()).get("MODE")
+    mode = mode or "rate"
+    if mode not in MODES:
+        raise KeyError(
+            f"MODE='{mode}'"
+        )
+    return mode
+
+
+def __catchUpPolicy(
+    data: dict = None,
+    scheduler: dict = None
+) -> str:
+    """
+    Function returns the catch-up policy of the task.
+    -------------------------------------------------
+    :type data: dict
+    :param data: object BaseExportSchema.TASK[key], None - LOGROTATION.
+
+    :type scheduler: dict
+    :param scheduler: object BaseExportSchema.SCHEDULER.
+
+    :rtype: str
+    :returns: "once", "all" or "skip".
+    """
+    if scheduler is None:
+        scheduler = BaseExportSchema.SCHEDULER or dict()
+    policy = None
+    if data is not None:
+        policy = data.get("SCHEDULE", dict()).get("CATCHUP")
+    policy = policy or scheduler.get("CATCHUP") or "once"
+    if policy not in CATCHUP:
+        raise KeyError(
+            f"CATCHUP='{policy}'"
+        )
+    return policy
+
+
+def __rotationStrategy(
+    data: dict = BaseExportSchema.LOGROTATION
+) -> str:
+    """
+    Function returns the strategy of the log rotation.
+    --------------------------------------------------
+    :type data: dict
+    :param data: object BaseExportSchema.LOGROTATION.
+
+    :rtype: str
+    :returns: "rename" or "truncate".
+    """
+    strategy = data["ARCH"].get("STRATEGY") or "rename"
+    if strategy not in STRATEGIES:
+        raise KeyError(
+            f"STRATEGY='{strategy}'"
+        )
+    # Only the renamed logfile is archived, the manifest is not used.
+    if strategy == "rename" and data["ARCH"].get("INCREMENTAL"):
+        raise KeyError(
+            f"INCREMENTAL='{data['ARCH']['INCREMENTAL']}' "
+            "with STRATEGY='rename'"
+        )
+    return strategy
+
+
+def __calcDTime(
+    data: dict = BaseExportSchema.TASK,
+    reference: datetime = None,
+    zone: ZoneTable | LocalZone = None
 ) -> tuple:
     """
     Function for calculating task completion time.
@@ -158,6 +416,13 @@ def __calcDTime(
     :type data: dict
     :param data: object BaseExportSchema.TASK
 
+    :type reference: datetime
+    :param reference: date and time of the calculation, \
+        None - current date and time.
+
+    :type zone: object
+    :param zone: time zone of DATE_TIME, None - system time zone.
+
     :rtype: tuple
     :returns: (
         datetime(year, month, day, hour, minute, second),
@@ -165,37 +430,101 @@ def __calcDTime(
         str
     )
     """
-    dt = tstamp = dtype = None
-    dTime = __formattingTypes(data)
-    if (
-        "/" in "".join(data.values()) or
-        any(isinstance(x, float) for x in dTime)
-    ):
-        mo, d, h, mi = dTime
-        call = AddIntervalTask(
-            month=mo,
-            day=d,
-            hour=h,
-            minute=mi
-        )
-        dt = call.current_datetime()
-        tstamp = dt.timestamp()
-        dtype = "IntervalTask"
-    elif (
-        "*" in "".join(data.values()) or
-        any(isinstance(x, int) for x in dTime)
-    ):
-        mo, d, h, mi = dTime
-        call = AddPlanTask(
-            month=mo,
-            day=d,
-            hour=h,
-            minute=mi
+    schedule = __compileDTime(data)
+    if schedule is None:
+        return None, None, None
+    if reference is None:
+        reference = ChronClock.now()
+    zone = zone or ZoneTable.get("")
+    timestamp = reference.timestamp()
+    dt = schedule.next_from(zone.to_wall(timestamp))
+    return dt, zone.to_timestamp(dt, timestamp), schedule.TYPE
+
+
+def __intervalShellTask(
+    val: TaskRecord,
+    data: dict,
+    reference: datetime = None,
+    zone: ZoneTable | LocalZone = None
+) -> tuple:
+    """
+    Function for calculating the next IntervalTask time.
+    ----------------------------------------------------
+    In the "rate" mode the times are anchor + run * interval, so the \
+        lateness of the runs is not accumulated. In the "delay" mode \
+            the interval is counted from the current time. The drift \
+                is the difference between the time and the grid.
+
+    :type val: TaskRecord
+    :param val: object QUEUE[key] with anchor and runs.
+
+    :type data: dict
+    :param data: object BaseExportSchema.TASK[key].
+
+    :type reference: datetime
+    :param reference: date and time of the calculation, \
+        None - current date and time.
+
+    :type zone: object
+    :param zone: time zone of DATE_TIME, None - system time zone.
+
+    :rtype: tuple
+    :returns: (timestamp, run number, drift (sec)).
+    """
+    schedule = __compileDTime(data["DATE_TIME"])
+    zone = zone or ZoneTable.get("")
+    if reference is None:
+        reference = ChronClock.now()
+    timestamp = reference.timestamp()
+    now = zone.to_wall(timestamp)
+    anchor = zone.to_wall(val.anchor)
+    if __taskMode(data) == "rate" and schedule.period() > 0:
+        runs = schedule.next_run(anchor, now)
+        dt = schedule.grid(anchor, runs)
+    else:
+        runs = val.runs + 1
+        dt = schedule.next_from(now)
+    tstamp = zone.to_timestamp(dt, timestamp)
+    drift = tstamp - zone.to_timestamp(
+        schedule.grid(anchor, runs),
+        timestamp
+    )
+    return tstamp, runs, drift
+
+
+def reportShellRotationTask(
+    logger: Logger,
+    out: dict
+) -> None:
+    """
+    Function for logging the result of the logfiles rotation.
+    ---------------------------------------------------------
+    :type logger: object
+    :param logger: getLogger() function reference.
+
+    :type out: dict
+    :param out: object RotateLogFiles.out.
+    """
+    if out["arch"]["arch_name"] is None:
+        logger.info(
+            "Archive skipped, the log files were not changed."
         )
-        dt = call.current_datetime()
-        tstamp = dt.timestamp()
-        dtype = "PlanTask"
-    return dt, tstamp, dtype
+    else:
+        logger.info(
+            f"Archive added: {out['arch']}"
+        )
+    if out["truncate"] is not None:
+        logger.info(
+            f"Logfile truncated: {out['truncate']}"
+        )
+    if out["deleted"]:
+        logger.info(
+            f"Archive deleted: {out['deleted']}"
+        )
+    logger.info(
+        f"Rotation completed: {out['seconds']}s, "
+        f"archive: {out['arch']['mb_s']} MB/s"
+    )
 
 
 def logShellRotationTask(
@@ -211,41 +540,117 @@ def logShellRotationTask(
     :type data: dict
     :param data: object BaseExportSchema.LOGROTATION.
     """
-    archName = data["ARCH"]["NAME"]
-    fromDir = os.path.dirname(data["LOGFILE"])
-    toDir = data["ARCH"]["DIR"]
-    typeArch = data["ARCH"]["TYPE"]
-    truncate = data["ARCH"]["TRUNCATE"]
-    call = LogArch(
-        archName=archName,
-        fromDir=fromDir,
-        toDir=toDir,
-        typeArch=typeArch
-    )
-    logger.info(
-        f"Archive added: {call.out}"
-    )
-    call = TruncateLogFile(
-        truncate=truncate,
-        abspath_filename=data["LOGFILE"]
+    try:
+        renamed = renameShellLogFile(data)
+    except OSError as err:
+        # The deleted logfile is created again by the handlers.
+        Logger.reopen(data["LOGFILE"])
+        logger.error(
+            f"Rotation skipped, the logfile is not renamed: {err}"
+        )
+        return
+    reportShellRotationTask(logger, RotateLogFiles(data, renamed).out)
+
+
+def renameShellLogFile(
+    data: dict = BaseExportSchema.LOGROTATION
+) -> str | None:
+    """
+    Function renames the logfile for the "rename" strategy.
+    -------------------------------------------------------
+    The logfile is renamed atomically and the handlers of the process \
+        are reopened, so no records are lost during the archiving.
+
+    :type data: dict
+    :param data: object BaseExportSchema.LOGROTATION.
+
+    :rtype: str | None
+    :returns: the renamed logfile or None - "truncate" strategy.
+    """
+    if __rotationStrategy(data) == "truncate":
+        return None
+    renamed = RenameLogFile(data["LOGFILE"]).out["renamed"]
+    Logger.reopen(data["LOGFILE"])
+    return renamed
+
+
+def startShellRotationTask(
+    logger: Logger,
+    data: dict = BaseExportSchema.LOGROTATION
+) -> bool:
+    """
+    Function starts the logfiles rotation in the worker process.
+    ------------------------------------------------------------
+    :type logger: object
+    :param logger: getLogger() function reference.
+
+    :type data: dict
+    :param data: object BaseExportSchema.LOGROTATION.
+
+    :rtype: bool
+    :returns: False, if the rotation is not started.
+    """
+    if not ROTATION.ready():
+        logger.warning(
+            "Rotation skipped, the previous rotation is in progress."
+        )
+        return False
+    try:
+        renamed = renameShellLogFile(data)
+    except OSError as err:
+        # The deleted logfile is created again by the handlers.
+        Logger.reopen(data["LOGFILE"])
+        logger.error(
+            f"Rotation skipped, the logfile is not renamed: {err}"
+        )
+        return False
+    ROTATION.start(data, renamed)
+    logger.info("Rotation started...")
+    return True
+
+
+def getSizeWatcher(
+    pathfile: str,
+    data: dict = BaseExportSchema.LOGROTATION
+) -> SizeWatcher:
+    """
+    Function returns the watcher of LOGROTATION.ARCH.MAX_SIZE.
+    ----------------------------------------------------------
+    :type pathfile: str
+    :param pathfile: path to the log file of the logger.
+
+    :type data: dict
+    :param data: object BaseExportSchema.LOGROTATION.
+
+    :rtype: object
+    :returns: SizeWatcher, disabled if the archiving is disabled.
+    """
+    limit = data["ARCH"]["MAX_SIZE"] if data["ARCH"]["ENABLE"] else 0
+    if not isinstance(limit, (int, float)) or limit < 0:
+        raise KeyError(
+            f"MAX_SIZE='{limit}'"
+        )
+    return SizeWatcher(
+        path=pathfile,
+        limit=limit * 1024 * 1024,
+        interval=data["ARCH"]["SIZE_CHECK"] or 5
     )
-    if call.out is not None:
-        logger.info(
-            f"Logfile truncated: {call.out}"
-        )
-    if data["DELETE"]["ENABLE"]:
-        enable = data["DELETE"]["ENABLE"]
-        count_days = data["DELETE"]["DAYS"]
-        call = DeleteLogArch(
-            enable=enable,
-            dirpath=toDir,
-            days=count_days
-        )
-        out = call.out
-        if len(out) > 0:
-            logger.info(
-                f"Archive deleted: {out}"
-            )
+
+
+def pollShellRotationTask(logger: Logger) -> None:
+    """
+    Function for receiving the status of the background rotation.
+    -------------------------------------------------------------
+    :type logger: object
+    :param logger: getLogger() function reference.
+    """
+    status = ROTATION.poll()
+    if isinstance(status, RotateLogFiles):
+        reportShellRotationTask(logger, status.out)
+    elif status is not None:
+        logger.error(
+            f"Rotation failed: {status!r}"
+        )
 
 
 def addShellTask(
@@ -254,6 +659,9 @@ def addShellTask(
     """
     Function of adding tasks to queue.
     ----------------------------------
+    The first times of all tasks are calculated by ScheduleBatch \
+        from one snapshot and the timer heap is built once.
+
     :type data: dict
     :param data: object BaseExportSchema.TASK.
     """
@@ -263,69 +671,561 @@ def addShellTask(
             f"Result: {data}"
         )
 
-    for key, val in data.items():
-        dt, tstamp, dtype = __calcDTime(val["DATE_TIME"])
-        if "" not in val["DATE_TIME"].values():
-            QUEUE.add(
-                key=key,
-                value={
-                    "DATE_TIME": str(dt),
-                    "TIMESTAMP": tstamp,
-                    "TYPE": dtype,
-                    "SHELL": val["EXECUTE"]["SHELL"],
-                }
+    keys = [
+        key for key, val in data.items()
+        if val["DATE_TIME"].get("CRON") or
+        "" not in val["DATE_TIME"].values()
+    ]
+    schedules = [__checkShellTask(key, data[key]) for key in keys]
+    zones = [__taskZone(data[key]) for key in keys]
+    timestamp = ChronClock.now().timestamp()
+    groups: Dict[ZoneTable | LocalZone, List[int]] = dict()
+    for index, zone in enumerate(zones):
+        groups.setdefault(zone, list()).append(index)
+    times: List[Tuple[datetime, float]] = [None] * len(keys)
+    for zone, indexes in groups.items():
+        result = ScheduleBatch.next_after(
+            [schedules[x] for x in indexes],
+            timestamp,
+            zone
+        )
+        for index, value in zip(indexes, result):
+            times[index] = value
+    deadlines: List[Tuple[str, float]] = list()
+    for key, schedule, zone, (_, tstamp) in zip(
+        keys, schedules, zones, times
+    ):
+        tstamp += __jitterShellTask(key, data[key])
+        dtype = TaskType(schedule.TYPE)
+        QUEUE.add(
+            key=key,
+            value=TaskRecord(
+                timestamp=tstamp,
+                type=dtype,
+                zone=zone,
+                shell=data[key]["EXECUTE"]["SHELL"],
+                anchor=tstamp if dtype is TaskType.INTERVAL else None
+            )
+        )
+        deadlines.append((key, CLOCK.to_monotonic(tstamp)))
+    QUEUE.push_many(deadlines)
+
+
+def addLogRotationTask(
+    data: dict = BaseExportSchema.LOGROTATION
+) -> None:
+    """
+    Function of adding the log rotation task to queue.
+    --------------------------------------------------
+    :type data: dict
+    :param data: object BaseExportSchema.LOGROTATION.
+    """
+    if data["ARCH"]["ENABLE"]:
+        __rotationStrategy(data)
+        __catchUpPolicy()
+        zone = __taskZone()
+        _, tstamp, dtype = __calcDTime(
+            data["ARCH"]["DATE_TIME"],
+            zone=zone
+        )
+        QUEUE.add(
+            key="LOGROTATION",
+            value=TaskRecord(
+                timestamp=tstamp,
+                type=TaskType(dtype),
+                zone=zone,
+                conf=data
+            )
+        )
+        QUEUE.push("LOGROTATION", CLOCK.to_monotonic(tstamp))
+
+
+def deleteShellTask(key: str) -> None:
+    """
+    Function of deleting the task from queue.
+    -----------------------------------------
+    :type key: str
+    :param key: task key.
+    """
+    if key in QUEUE:
+        QUEUE.delete(key)
+    QUEUE.discard(key)
+    MISSED.pop(key, None)
+
+
+def reloadShellTask(
+    cfg: BaseExportSchema,
+    logger: Logger
+) -> None:
+    """
+    Function for applying the changed configuration file.
+    -----------------------------------------------------
+    Only added, removed and changed tasks are updated in the queue, \
+        unchanged tasks keep their calculated time. If only \
+            EXECUTE of the task was changed, its time is kept too.
+
+    :type cfg: object
+    :param cfg: initCfg() function reference.
+
+    :type logger: object
+    :param logger: getLogger() function reference.
+    """
+    SCHEDULES.clear()
+    try:
+        data = BaseExportSchema.read_file(cfg.CONFPATH)
+        for key in ("TASK", "LOGROTATION"):
+            if not isinstance(data.get(key), dict):
+                raise KeyError(key)
+        ZoneTable.get(data["SCHEDULER"]["TZ"])
+        __catchUpPolicy(scheduler=data["SCHEDULER"])
+    except (OSError, ValueError, KeyError) as err:
+        logger.error(
+            f"Settings are not reloaded: {cfg.CONFPATH}, {err}"
+        )
+        return
+
+    # The tasks without SCHEDULE.TZ are calculated again in the new zone.
+    zoneChanged = data["SCHEDULER"]["TZ"] != cfg.SCHEDULER["TZ"]
+    BaseExportSchema.SCHEDULER = data["SCHEDULER"]
+    oldTask, newTask = cfg.TASK, data["TASK"]
+    added = [x for x in newTask if x not in oldTask]
+    removed = [x for x in oldTask if x not in newTask]
+    changed = [
+        x for x in newTask
+        if x in oldTask and (newTask[x] != oldTask[x] or zoneChanged)
+    ]
+    for key in removed:
+        deleteShellTask(key)
+    batch = dict()
+    for key in added + changed:
+        val = newTask[key]
+        # The task rejected before is checked and added as the new one.
+        if key in changed and key in QUEUE and not zoneChanged and (
+            val["DATE_TIME"] == oldTask[key]["DATE_TIME"] and
+            val.get("SCHEDULE") == oldTask[key].get("SCHEDULE")
+        ):
+            try:
+                checkExecute(val["EXECUTE"])
+            except ValueError as err:
+                deleteShellTask(key)
+                logger.error(
+                    f"Task '{key}' is not added: {err}"
+                )
+                continue
+            record = QUEUE.get(key=key)
+            record.shell = val["EXECUTE"]["SHELL"]
+            QUEUE.update(key=key, value=record)
+            continue
+        deleteShellTask(key)
+        try:
+            __checkShellTask(key, val)
+        except (KeyError, TypeError, ValueError) as err:
+            logger.error(
+                f"Task '{key}' is not added: {err}"
+            )
+            continue
+        batch[key] = val
+    # The checked tasks are added at once, the timer heap is built once.
+    try:
+        addShellTask(batch)
+    except (KeyError, TypeError, ValueError):
+        # One bad task does not stop the others.
+        for key, val in batch.items():
+            try:
+                addShellTask({key: val})
+            except (KeyError, TypeError, ValueError) as err:
+                logger.error(
+                    f"Task '{key}' is not added: {err}"
+                )
+
+    # The logger writes to the old file until the restart.
+    if data["LOGROTATION"]["LOGFILE"] != cfg.LOGROTATION["LOGFILE"]:
+        logger.warning(
+            "LOGROTATION.LOGFILE is applied after restart."
+        )
+        data["LOGROTATION"]["LOGFILE"] = cfg.LOGROTATION["LOGFILE"]
+    if data["LOGROTATION"] != cfg.LOGROTATION or zoneChanged:
+        deleteShellTask("LOGROTATION")
+        try:
+            addLogRotationTask(data["LOGROTATION"])
+        except (KeyError, TypeError, ValueError) as err:
+            logger.error(
+                f"LOGROTATION is not added: {err}"
+            )
+    for key in ("EXECUTOR", "SHARDING"):
+        if data[key] != getattr(cfg, key):
+            logger.warning(
+                f"{key} is applied after restart."
             )
+            data[key] = getattr(cfg, key)
+    data["CONFPATH"] = cfg.CONFPATH
+    for key, value in data.items():
+        setattr(BaseExportSchema, key, value)
+    CopyConfDump(
+        enable=cfg.CONFDUMP["ENABLE"],
+        fromFilename=cfg.CONFPATH,
+        toDirFilename=cfg.CONFDUMP["DIR"]
+    )
+    logger.info(
+        f"Settings reloaded: {cfg.CONFPATH}, "
+        f"added: {added}, removed: {removed}, changed: {changed}\n"
+        f"size: {QUEUE.size()}"
+    )
 
 
 def updateShellTask(
     worktime: time,
     data: dict = BaseExportSchema.TASK,
-) -> Generator[None, str, None]:
+) -> Generator[Tuple[str, float], None, None]:
     """
     Function for updating tasks in the queue.
     -----------------------------------------
     :type worktime: time
-    :param worktime: links to current timestamp.
+    :param worktime: links to current monotonic timestamp.
 
     :type data: dict
     :param data: object BaseExportSchema.TASK.
 
     :rtype: Generator
-    :returns: None | str.
+    :returns: (task key, scheduled timestamp) of every due task.
     """
     if data is None:
         raise KeyError(
             "Error. Configuration file data was not transferred. "
             f"Result: {data}"
         )
+    # One snapshot of the wall clock for all tasks of the tick.
+    reference = ChronClock.now()
+    while (key := QUEUE.pop(worktime)) is not None:
+        scheduled = QUEUE.get(key=key).timestamp
+        scheduleShellTask(key, data, reference, worktime)
+        yield key, scheduled
+
+
+def scheduleShellTask(
+    key: str,
+    data: dict = BaseExportSchema.TASK,
+    reference: datetime = None,
+    worktime: float = None
+) -> float:
+    """
+    Function for calculating the next task time in the queue.
+    ---------------------------------------------------------
+    :type key: str
+    :param key: task key.
+
+    :type data: dict
+    :param data: object BaseExportSchema.TASK.
+
+    :type reference: datetime
+    :param reference: date and time of the calculation, \
+        None - current date and time.
+
+    :type worktime: float
+    :param worktime: monotonic timestamp of the tick, the next \
+        deadline is moved after it. None - not checked.
+
+    :rtype: float
+    :returns: timestamp of the next task time.
+    """
+    val = QUEUE.get(key=key)
+    if key == "LOGROTATION":
+        val.zone = __taskZone()
+        _, tstamp, _ = __calcDTime(
+            val.conf["ARCH"]["DATE_TIME"],
+            reference,
+            val.zone
+        )
+    elif val.anchor is not None:
+        # IntervalTask keeps the offset of addShellTask() in anchor.
+        val.zone = __taskZone(data[key])
+        tstamp, val.runs, drift = __intervalShellTask(
+            val,
+            data[key],
+            reference,
+            val.zone
+        )
+        val.drift = round(drift, 3)
+        val.shell = data[key]["EXECUTE"]["SHELL"]
+    else:
+        val.zone = __taskZone(data[key])
+        _, tstamp, _ = __calcDTime(
+            data[key]["DATE_TIME"],
+            reference,
+            val.zone
+        )
+        tstamp += __jitterShellTask(key, data[key])
+        val.shell = data[key]["EXECUTE"]["SHELL"]
+    deadline = CLOCK.to_monotonic(tstamp)
+    if worktime is not None and deadline <= worktime:
+        # The passed time is not popped again in the same tick.
+        tstamp += worktime - deadline + 1
+        deadline = worktime + 1
+    val.timestamp = tstamp
+    # The changed copy of the record is stored with the new deadline.
+    QUEUE.update(key=key, value=val)
+    QUEUE.push(key, deadline)
+    return tstamp
+
+
+def __countMissed(
+    dateTime: dict,
+    timestamp: float,
+    worktime: float,
+    limit: int,
+    zone: ZoneTable | LocalZone = None
+) -> int:
+    """
+    Function for counting the task runs missed before the worktime.
+    ---------------------------------------------------------------
+    :type dateTime: dict
+    :param dateTime: object BaseExportSchema.TASK[key].DATE_TIME.
+
+    :type timestamp: float
+    :param timestamp: first missed task time.
+
+    :type worktime: float
+    :param worktime: current timestamp.
+
+    :type limit: int
+    :param limit: maximum number of counted runs.
+
+    :type zone: object
+    :param zone: time zone of DATE_TIME, None - system time zone.
+
+    :rtype: int
+    :returns: number of missed runs.
+    """
+    count = 0
+    while timestamp <= worktime and count < limit:
+        count += 1
+        _, tstamp, _ = __calcDTime(
+            dateTime,
+            datetime.fromtimestamp(timestamp + 1),
+            zone
+        )
+        if tstamp is None or tstamp <= timestamp:
+            break
+        timestamp = tstamp
+    return count
+
+
+def catchUpShellTask(
+    jump: float,
+    logger: Logger,
+    data: dict = BaseExportSchema.TASK,
+    scheduler: dict = BaseExportSchema.SCHEDULER
+) -> None:
+    """
+    Function for applying the catch-up policy after the clock jump.
+    ---------------------------------------------------------------
+    The deadlines are moved to the new wall-clock time. Tasks whose \
+        time has passed during the jump are processed by the \
+            SCHEDULE.CATCHUP policy: "once" - run once, "all" - run \
+                every missed time, "skip" - wait for the next time.
+    After the backward jump IntervalTasks are calculated again \
+        from the current time.
+
+    :type jump: float
+    :param jump: size of the wall-clock jump (sec).
+
+    :type logger: object
+    :param logger: getLogger() function reference.
+
+    :type data: dict
+    :param data: object BaseExportSchema.TASK.
+
+    :type scheduler: dict
+    :param scheduler: object BaseExportSchema.SCHEDULER.
+    """
+    worktime = time.time()
     for key, val in QUEUE.get().items():
-        if worktime >= val["TIMESTAMP"]:
-            if key == "LOGROTATION":
-                dt, tstamp, dtype = __calcDTime(
-                    val["CONF_DATA"]["ARCH"]["DATE_TIME"]
-                )
-                QUEUE.update(
-                    key=key,
-                    value={
-                        "DATE_TIME": str(dt),
-                        "TIMESTAMP": tstamp,
-                        "TYPE": dtype,
-                        "CONF_DATA": val["CONF_DATA"]
-                    }
-                )
-            else:
-                dt, tstamp, dtype = __calcDTime(data[key]["DATE_TIME"])
-                QUEUE.update(
-                    key=key,
-                    value={
-                        "DATE_TIME": str(dt),
-                        "TIMESTAMP": tstamp,
-                        "TYPE": dtype,
-                        "SHELL": data[key]["EXECUTE"]["SHELL"],
-                    }
+        if jump < 0 and val.type is TaskType.INTERVAL:
+            scheduleShellTask(key, data)
+            continue
+        if val.timestamp > worktime:
+            QUEUE.push(key, CLOCK.to_monotonic(val.timestamp))
+            continue
+        policy = __catchUpPolicy(
+            None if key == "LOGROTATION" else data[key],
+            scheduler
+        )
+        if key == "LOGROTATION" and policy == "all":
+            policy = "once"
+        # The copy keeps the missed time, scheduleShellTask() stores
+        # the new one in the queue.
+        missed = val.timestamp
+        runs = 1
+        if policy == "skip":
+            runs = 0
+            scheduleShellTask(key, data)
+        else:
+            if policy == "all":
+                runs = MISSED[key] = __countMissed(
+                    data[key]["DATE_TIME"],
+                    val.timestamp,
+                    worktime,
+                    scheduler["CATCHUP_LIMIT"],
+                    __taskZone(data[key])
                 )
-            yield key
-    yield None
+            QUEUE.push(key, CLOCK.to_monotonic(val.timestamp))
+        logger.info(
+            f"Task '{key}' missed the time: "
+            f"{datetime.fromtimestamp(missed)}, "
+            f"catch-up: {policy}, runs: {runs}"
+        )
+
+
+def dispatchShellTask(
+    worktime: time,
+    data: dict = BaseExportSchema.TASK,
+) -> List[Tuple[str, float]]:
+    """
+    Function for draining all due tasks from the queue in one pass.
+    ---------------------------------------------------------------
+    :type worktime: time
+    :param worktime: links to current monotonic timestamp.
+
+    :type data: dict
+    :param data: object BaseExportSchema.TASK.
+
+    :rtype: list
+    :returns: [(task key, scheduled timestamp), ...] ordered by deadline.
+    """
+    return list(updateShellTask(worktime, data))
+
+
+def __iterShellTask(
+    key: str,
+    schedule: CronSchedule | IntervalSchedule | PlanSchedule,
+    zone: ZoneTable | LocalZone,
+    start: float,
+    end: float,
+    mode: str = "delay",
+    offset: float = 0
+) -> Generator[Tuple[float, str], None, None]:
+    """
+    Function yields the task times from start to end.
+    -------------------------------------------------
+    :type key: str
+    :param key: task key.
+
+    :type schedule: object
+    :param schedule: compiled DATE_TIME of the task.
+
+    :type zone: object
+    :param zone: time zone of the task.
+
+    :type start: float
+    :param start: beginning of the window (timestamp).
+
+    :type end: float
+    :param end: end of the window (timestamp), inclusive.
+
+    :type mode: str
+    :param mode: IntervalTask mode, "rate" or "delay".
+
+    :type offset: float
+    :param offset: start offset (sec) of the task, see \
+        __jitterShellTask().
+
+    :rtype: Generator
+    :returns: (timestamp, task key).
+    """
+    # IntervalTask is calculated from the start, as by addShellTask().
+    after = start - offset
+    if schedule.TYPE == "IntervalTask":
+        after = start
+    begin = zone.to_wall(after)
+    times = schedule.iter_from(begin)
+    if mode == "rate" and schedule.TYPE == "IntervalTask":
+        times = schedule.iter_rate(begin)
+    for dTime in times:
+        tstamp = zone.to_timestamp(dTime, after)
+        after = tstamp
+        tstamp += offset
+        if tstamp > end:
+            return
+        if tstamp >= start:
+            yield tstamp, key
+
+
+def projectShellTask(
+    start: datetime,
+    end: datetime,
+    data: dict = BaseExportSchema.TASK,
+    keys: List[str] = None
+) -> Generator[Tuple[datetime, str], None, None]:
+    """
+    Function for the lazy projection of the task times.
+    ---------------------------------------------------
+    The times of all tasks are merged in chronological order. \
+        Only one next time of every task is kept in memory. The \
+            times of the tasks with TZ are converted to the system \
+                time zone. The JITTER offset of the task is added \
+                    as by the scheduler.
+
+    :type start: datetime
+    :param start: beginning of the window.
+
+    :type end: datetime
+    :param end: end of the window, inclusive.
+
+    :type data: dict
+    :param data: object BaseExportSchema.TASK.
+
+    :type keys: list
+    :param keys: projected task keys, None - all tasks.
+
+    :rtype: Generator
+    :returns: (datetime, task key) ordered by datetime.
+    """
+    if data is None:
+        raise KeyError(
+            "Error. Configuration file data was not transferred. "
+            f"Result: {data}"
+        )
+    streams = list()
+    for key in (keys if keys is not None else data):
+        if key not in data:
+            raise KeyError(
+                f"Error. The task '{key}' not found."
+            )
+        dateTime = data[key]["DATE_TIME"]
+        if not dateTime.get("CRON") and "" in dateTime.values():
+            continue
+        schedule = __compileDTime(dateTime)
+        if schedule is not None:
+            streams.append(__iterShellTask(
+                key,
+                schedule,
+                __taskZone(data[key]),
+                start.timestamp(),
+                end.timestamp(),
+                __taskMode(data[key]),
+                __jitterShellTask(key, data[key])
+            ))
+    for tstamp, key in heapq.merge(*streams):
+        yield datetime.fromtimestamp(tstamp), key
+
+
+def histogramShellTask(
+    times: Iterable[Tuple[datetime, str]]
+) -> Dict[datetime, int]:
+    """
+    Function for counting the task starts per minute.
+    -------------------------------------------------
+    :type times: Iterable
+    :param times: result of projectShellTask().
+
+    :rtype: dict
+    :returns: {minute: number of starts}, ordered by minute.
+    """
+    counter: Dict[datetime, int] = dict()
+    for dTime, _ in times:
+        minute = dTime.replace(second=0, microsecond=0)
+        counter[minute] = counter.get(minute, 0) + 1
+    return counter
 
 
 def handle_signal(
@@ -346,23 +1246,61 @@ def handle_signal(
     )
 
 
+def getShardMember(
+    logger: Logger,
+    data: dict = BaseExportSchema.SHARDING
+) -> ShardMember | None:
+    """
+    Function for joining the instance to the shard group.
+    -----------------------------------------------------
+    :type logger: object
+    :param logger: getLogger() function reference.
+
+    :type data: dict
+    :param data: object BaseExportSchema.SHARDING.
+
+    :rtype: object
+    :returns: ShardMember or None, if the sharding is disabled.
+    """
+    if not data["ENABLE"]:
+        return None
+    shard = ShardMember(
+        dirpath=data["DIR"],
+        name=data["NAME"],
+        heartbeat=data["HEARTBEAT"],
+        ttl=data["TTL"],
+        replicas=data["REPLICAS"]
+    )
+    shard.join()
+    logger.info(
+        f"Shard member joined: {shard.name}, dir: {shard.dirpath}"
+    )
+    return shard
+
+
 def runningShellTask(
-    sleep: int = 1,
+    sleep: int = 60,
     console: bool = False,
-    ping_message: int = 10
+    ping_message: int = 10,
+    engine: str = None
 ) -> None:
     """
     Function to initialize the application.
     ---------------------------------------
     :type sleep: int
-    :param sleep: sleep cycle for a while.
+    :param sleep: maximum sleep cycle (sec) until the next deadline.
 
     :type console: bool
     :param console: output data to the console.
 
     :type ping_message: int
     :param ping_message: message time (sec).
+
+    :type engine: str
+    :param engine: executor engine, replaces EXECUTOR.ENGINE.
     """
+    executor = None
+    shard = None
     try:
         cfg = initCfg()
         logger = getLogger(
@@ -372,25 +1310,19 @@ def runningShellTask(
         logger.info(
             f"Getting settings: {cfg.CONFPATH}"
         )
+        if engine is not None:
+            cfg.EXECUTOR["ENGINE"] = engine
+        executor = getExecutor(logger, cfg.EXECUTOR)
+        logger.info(
+            f"Executor: {cfg.EXECUTOR}"
+        )
         CopyConfDump(
             enable=cfg.CONFDUMP["ENABLE"],
             fromFilename=cfg.CONFPATH,
             toDirFilename=cfg.CONFDUMP["DIR"]
         )
         addShellTask(cfg.TASK)
-        if cfg.LOGROTATION["ARCH"]["ENABLE"]:
-            dt, tstamp, dtype = __calcDTime(
-                cfg.LOGROTATION["ARCH"]["DATE_TIME"]
-            )
-            QUEUE.add(
-                key="LOGROTATION",
-                value={
-                    "DATE_TIME": str(dt),
-                    "TIMESTAMP": tstamp,
-                    "TYPE": dtype,
-                    "CONF_DATA": cfg.LOGROTATION
-                }
-            )
+        addLogRotationTask(cfg.LOGROTATION)
         logger.info(
             "Adding task queue: "
             f"size: {QUEUE.size()}\n"
@@ -398,37 +1330,106 @@ def runningShellTask(
         )
         signal.signal(signal.SIGTERM, handle_signal)
         signal.signal(signal.SIGINT, handle_signal)
-        pingMsg = time.time() + ping_message
+        CLOCK.threshold = cfg.SCHEDULER["JUMP_THRESHOLD"]
+        watcher = ConfWatcher(cfg.CONFPATH, cfg.SCHEDULER["RELOAD"])
+        logfile = cfg.LOGROTATION["LOGFILE"]
+        sizeWatcher = getSizeWatcher(logfile, cfg.LOGROTATION)
+        shard = getShardMember(logger, cfg.SHARDING)
+        limiter = StartLimiter(cfg.SCHEDULER["MAX_STARTS"])
+        pingMsg = CLOCK.monotonic() + ping_message
         while True:
-            worktime = time.time()
-            cursor = updateShellTask(worktime, cfg.TASK)
-            keyTask = next(cursor)
-            if keyTask is not None:
+            if watcher.changed(CLOCK.monotonic()):
+                reloadShellTask(cfg, logger)
+                CLOCK.threshold = cfg.SCHEDULER["JUMP_THRESHOLD"]
+                limiter.rate = cfg.SCHEDULER["MAX_STARTS"]
+                sizeWatcher = getSizeWatcher(logfile, cfg.LOGROTATION)
+            jump = CLOCK.check()
+            if jump:
+                logger.warning(
+                    f"Wall clock jump detected: {jump:+.3f}s"
+                )
+                catchUpShellTask(jump, logger, cfg.TASK, cfg.SCHEDULER)
+            worktime = CLOCK.monotonic()
+            if shard is not None and shard.update(worktime):
+                logger.info(
+                    f"Shard members changed: {shard.ring.members}, "
+                    f"tasks: {shard.owned(list(cfg.TASK))}"
+                )
+            for keyTask, scheduled in dispatchShellTask(worktime, cfg.TASK):
                 if keyTask == "LOGROTATION":
-                    data: dict = QUEUE.get(key=keyTask)["CONF_DATA"]
-                    logShellRotationTask(logger, data)
+                    startShellRotationTask(
+                        logger,
+                        QUEUE.get(key=keyTask).conf
+                    )
+                elif shard is not None and not shard.owns(keyTask):
+                    MISSED.pop(keyTask, None)
                 else:
-                    shellCmd: list = QUEUE.get(key=keyTask)["SHELL"]
-                    {
-                        logger.info(
-                            f"shell:\n{os.popen(_).read().strip()}"
-                        ) for _ in shellCmd
-                    }
-                    updateTask = {
-                        keyTask: QUEUE.get(key=keyTask)
-                    }
-                    logger.info(
-                        "Updated task queue: "
-                        f"size: {QUEUE.size()}\n"
-                        f"{updateTask}"
+                    DEFERRED.append((keyTask, scheduled))
+            while DEFERRED and limiter.take(CLOCK.monotonic()):
+                keyTask, scheduled = DEFERRED.popleft()
+                if keyTask not in cfg.TASK:
+                    continue
+                lateness = time.time() - scheduled
+                try:
+                    executor.submit(
+                        keyTask,
+                        cfg.TASK[keyTask]["EXECUTE"],
+                        MISSED.pop(keyTask, 1)
+                    )
+                except (KeyError, TypeError, ValueError) as err:
+                    logger.error(
+                        f"Task '{keyTask}' is not started: {err}"
                     )
+                    continue
+                updateTask = {
+                    keyTask: QUEUE.get(key=keyTask)
+                }
+                logger.info(
+                    "Updated task queue: "
+                    f"size: {QUEUE.size()}, "
+                    f"executor: {executor.stats(keyTask)}, "
+                    f"deferred: {len(DEFERRED)}, "
+                    f"lateness: {lateness:.3f}s\n"
+                    f"{updateTask}"
+                )
+            pollShellRotationTask(logger)
+            if ROTATION.ready() and sizeWatcher.exceeded(worktime):
+                logger.info(
+                    f"Logfile size limit reached: {sizeWatcher.size} bytes"
+                )
+                startShellRotationTask(logger, cfg.LOGROTATION)
             if worktime >= pingMsg:
                 logger.info("Server is active...")
                 pingMsg = worktime + ping_message
-            time.sleep(sleep)
+            deadline = min(
+                x for x in (
+                    QUEUE.peek(),
+                    pingMsg,
+                    watcher.deadline,
+                    sizeWatcher.deadline if ROTATION.ready() else None,
+                    shard.deadline if shard is not None else None
+                )
+                if x is not None
+            )
+            if ROTATION.running():
+                deadline = min(deadline, CLOCK.monotonic() + 1)
+            if DEFERRED:
+                deadline = min(
+                    deadline,
+                    limiter.deadline(CLOCK.monotonic())
+                )
+            time.sleep(
+                min(max(deadline - CLOCK.monotonic(), 0), sleep)
+            )
     except KeyError as err:
         raise KeyError(
             "The configuration file (conf.json) was not accepted. "
             f"There is an error in the {err} field. "
             "Restore from a copy or edit the field yourself."
         )
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False)
+        ROTATION.shutdown()
+        if shard is not None:
+            shard.leave()
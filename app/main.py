@@ -1,19 +1,209 @@
 # -*- coding: utf-8 -*-
 import sys
+import argparse
+import itertools
+from datetime import (
+    datetime,
+    timedelta
+)
+from core.schema import BaseExportSchema
+from exec.benchChron import (
+    benchChron,
+    checkChron
+)
 from exec.runTask import (
     getLogger,
+    histogramShellTask,
+    projectShellTask,
     runningShellTask
 )
 
 
+def getArgs() -> argparse.Namespace:
+    """Function for parsing command line arguments."""
+    parser = argparse.ArgumentParser(
+        prog="shellTaskEnv",
+        description="Shell task scheduler."
+    )
+    parser.add_argument(
+        "--engine",
+        choices=("thread", "asyncio"),
+        default=None,
+        help="executor engine, replaces EXECUTOR.ENGINE of conf.json"
+    )
+    commands = parser.add_subparsers(dest="command")
+    project = commands.add_parser(
+        "project",
+        help="print the next task times and the starts per minute"
+    )
+    project.add_argument(
+        "--conf",
+        default=BaseExportSchema.__SCHEMA__["CONFPATH"],
+        help="path to conf.json"
+    )
+    project.add_argument(
+        "--start",
+        type=datetime.fromisoformat,
+        default=None,
+        help="beginning of the window 'YYYY-MM-DD HH:MM', default - now"
+    )
+    project.add_argument(
+        "--hours",
+        type=float,
+        default=24,
+        help="length of the window (hours)"
+    )
+    project.add_argument(
+        "--task",
+        action="append",
+        default=None,
+        help="task key, can be repeated, default - all tasks"
+    )
+    project.add_argument(
+        "--count",
+        type=int,
+        default=10,
+        help="number of printed times of every task, 0 - all"
+    )
+    project.add_argument(
+        "--merge",
+        action="store_true",
+        help="print the times of all tasks in one list"
+    )
+    project.add_argument(
+        "--top",
+        type=int,
+        default=10,
+        help="number of printed busiest minutes"
+    )
+    bench = commands.add_parser(
+        "bench",
+        help="measure and check the next time calculations"
+    )
+    bench.add_argument(
+        "--size",
+        type=int,
+        default=10000,
+        help="number of synthetic tasks"
+    )
+    bench.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="number of measurements, the best one is printed"
+    )
+    bench.add_argument(
+        "--cases",
+        type=int,
+        default=200,
+        help="number of random checks, 0 - only the edge dates"
+    )
+    bench.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="seed of the synthetic tasks and checks"
+    )
+    bench.add_argument(
+        "--examples",
+        type=int,
+        default=5,
+        help="number of printed mismatches of every calculation"
+    )
+    return parser.parse_args()
+
+
+def projectTasks(args: argparse.Namespace) -> None:
+    """
+    Function prints the projection of the task times.
+    -------------------------------------------------
+    :type args: argparse.Namespace
+    :param args: arguments of the "project" command.
+    """
+    conf = BaseExportSchema.read_file(args.conf)
+    BaseExportSchema.SCHEDULER = conf["SCHEDULER"]
+    data = conf["TASK"]
+    start = args.start or datetime.now()
+    end = start + timedelta(hours=args.hours)
+    keys = args.task if args.task else list(data)
+    count = args.count or None
+    print(f"Window: {start:%Y-%m-%d %H:%M:%S} - {end:%Y-%m-%d %H:%M:%S}")
+
+    if args.merge:
+        times = projectShellTask(start, end, data, keys)
+        for dTime, key in itertools.islice(times, count):
+            print(f"{dTime:%Y-%m-%d %H:%M:%S}  {key}")
+    else:
+        for key in keys:
+            times = projectShellTask(start, end, data, [key])
+            print(f"{key}:")
+            for dTime, _ in itertools.islice(times, count):
+                print(f"    {dTime:%Y-%m-%d %H:%M:%S}")
+
+    histogram = histogramShellTask(projectShellTask(start, end, data, keys))
+    total = sum(histogram.values())
+    print(
+        f"Starts: {total}, minutes with starts: {len(histogram)}, "
+        f"max per minute: {max(histogram.values(), default=0)}"
+    )
+    busiest = sorted(
+        histogram.items(),
+        key=lambda x: (-x[1], x[0])
+    )[:args.top]
+    for minute, starts in sorted(busiest):
+        print(f"{minute:%Y-%m-%d %H:%M}  {starts:>6}  {'#' * min(starts, 50)}")
+
+
+def benchTasks(args: argparse.Namespace) -> int:
+    """
+    Function prints the benchmark and the check of the task times.
+    --------------------------------------------------------------
+    :type args: argparse.Namespace
+    :param args: arguments of the "bench" command.
+
+    :rtype: int
+    :returns: exit status, 1 - there are mismatches, the known \
+        legacy mismatches are only printed.
+    """
+    print(f"{'Calculation':<28}{'count':>8}{'sec':>10}{'per sec':>12}")
+    for name, count, seconds in benchChron(
+        args.size,
+        args.repeat,
+        args.seed
+    ):
+        rate = count / seconds if seconds else 0
+        print(f"{name:<28}{count:>8}{seconds:>10.4f}{rate:>12.0f}")
+
+    status = 0
+    print(
+        f"{'Check':<28}{'ok':>8}{'diff':>10}{'error':>12}{'legacy':>10}"
+    )
+    for name, stat in checkChron(args.cases, args.seed).items():
+        print(
+            f"{name:<28}{stat['ok']:>8}{stat['diff']:>10}"
+            f"{stat['error']:>12}{stat['legacy']:>10}"
+        )
+        for example in stat["examples"][:args.examples]:
+            print(f"    {example}")
+        if stat["diff"] or stat["error"]:
+            status = 1
+    return status
+
+
 def main() -> None:
     """Main function to launch the application."""
+    args = getArgs()
+    if args.command == "project":
+        projectTasks(args)
+        return
+    if args.command == "bench":
+        sys.exit(benchTasks(args))
     rootLogger = getLogger(
         name="shellTaskEnvRoot"
     )
     try:
         rootLogger.info("Server is running...")
-        runningShellTask()
+        runningShellTask(engine=args.engine)
     except SystemExit as err:
         rootLogger.warning(err)
         sys.exit()